@@ -1,79 +1,60 @@
+from config import STATS_DB_PATH
+from stats_store import open_store, wilson_interval
 
-import json
-from collections import Counter, defaultdict
+def analyze_stats(db_path: str = STATS_DB_PATH):
+    # Everything below reads the running rollups, so this stays instant however many games are stored
+    with open_store(db_path) as store:
+        summary = store.summary()
+        player_stats = store.player_stats()
+        breakdowns = {dimension: store.rollup(dimension) for dimension in ("model", "provider", "role")}
+        player_counts = store.player_count_stats()
 
-def analyze_stats():
-    with open('game_stats.json', 'r') as f:
-        data = json.load(f)
+    total_games = summary['games']
 
-    games = data.get('games', [])
-    total_games = len(games)
-    
     if total_games == 0:
         print("No games found.")
         return
 
-    mafia_wins = 0
-    town_wins = 0
-    total_turns = 0
-
-    player_stats = defaultdict(lambda: {'games_played': 0, 'wins': 0, 'mafia_games': 0, 'mafia_wins': 0, 'town_games': 0, 'town_wins': 0, 'survived': 0})
-    
-    for game in games:
-        if game.get('winner') == 'Mafia':
-            mafia_wins += 1
-        else:
-            town_wins += 1
-        
-        total_turns += game.get('turns', 0)
-        
-        # Determine winner for this game to check individual player wins
-        game_winner = game.get('winner')
-
-        for player in game.get('players', []):
-            name = player.get('name')
-            role = player.get('role')
-            survived = player.get('survived')
-            
-            stats = player_stats[name]
-            stats['games_played'] += 1
-            if survived:
-                stats['survived'] += 1
-            
-            is_mafia = role == 'Mafia'
-            if is_mafia:
-                stats['mafia_games'] += 1
-                if game_winner == 'Mafia':
-                    stats['mafia_wins'] += 1
-                    stats['wins'] += 1
-            else:
-                stats['town_games'] += 1
-                if game_winner == 'Town':
-                    stats['town_wins'] += 1
-                    stats['wins'] += 1
+    mafia_wins = summary['mafia_wins']
+    town_wins = summary['town_wins']
 
     print(f"Total Games: {total_games}")
     print(f"Mafia Wins: {mafia_wins} ({mafia_wins/total_games*100:.1f}%)")
     print(f"Town Wins: {town_wins} ({town_wins/total_games*100:.1f}%)")
-    print(f"Average Turns: {total_turns/total_games:.1f}")
-    
-    print("\nPlayer Stats (Name | GP | Win% | Surv% | Mafia Win% | Town Win%):")
-    sorted_players = sorted(player_stats.items(), key=lambda item: (item[1]['wins']/item[1]['games_played']), reverse=True)
-    
-    for name, stats in sorted_players:
+    print(f"Average Turns: {summary['avg_turns']:.1f}")
+
+    print("\nPlayer Stats (Name | GP | Win% | Surv% | Mafia Win% | Town Win% | Win 95% CI | Elo):")
+
+    for stats in player_stats:
+        name = stats['name']
         gp = stats['games_played']
         win_rate = (stats['wins'] / gp) * 100
         surv_rate = (stats['survived'] / gp) * 100
-        
+
         mafia_wr = 0.0
         if stats['mafia_games'] > 0:
             mafia_wr = (stats['mafia_wins'] / stats['mafia_games']) * 100
-            
+
         town_wr = 0.0
         if stats['town_games'] > 0:
             town_wr = (stats['town_wins'] / stats['town_games']) * 100
-            
-        print(f"{name:<10} | {gp:<2} | {win_rate:>5.1f}% | {surv_rate:>5.1f}% | {mafia_wr:>9.1f}% ({stats['mafia_games']}) | {town_wr:>8.1f}% ({stats['town_games']})")
+
+        low, high = stats['win_ci']
+        elo = f"{stats['elo']:.0f}" if stats['elo'] is not None else "-"
+        print(f"{name:<10} | {gp:<2} | {win_rate:>5.1f}% | {surv_rate:>5.1f}% | {mafia_wr:>9.1f}% ({stats['mafia_games']}) | {town_wr:>8.1f}% ({stats['town_games']}) | {low*100:>4.1f}-{high*100:>5.1f}% | {elo}")
+
+    for dimension, rows in breakdowns.items():
+        print(f"\nBy {dimension.capitalize()} (Key | GP | Win% | Win 95% CI | Surv%):")
+        for stats in rows:
+            low, high = stats['win_ci']
+            print(f"{stats['key']:<30} | {stats['games']:<4} | {stats['wins']/stats['games']*100:>5.1f}% | "
+                  f"{low*100:>4.1f}-{high*100:>5.1f}% | {stats['survived']/stats['games']*100:>5.1f}%")
+
+    print("\nBy Player Count (Players | Games | Mafia Win% | Mafia Win 95% CI | Avg Turns):")
+    for row in player_counts:
+        low, high = wilson_interval(row['mafia_wins'], row['games'])
+        print(f"{row['player_count']:<7} | {row['games']:<5} | {row['mafia_wins']/row['games']*100:>9.1f}% | "
+              f"{low*100:>4.1f}-{high*100:>5.1f}% | {row['total_turns']/row['games']:.1f}")
 
 if __name__ == "__main__":
     analyze_stats()
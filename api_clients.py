@@ -2,379 +2,946 @@ import os
 import json
 import logging
 import time
-from typing import Optional, Dict, Any, Type
+import asyncio
+import queue
+import weakref
+import threading
+import subprocess
+import concurrent.futures
+import urllib.error
+from typing import Optional, Dict, Any, Type, List, Tuple, Union, Callable, Iterable, Iterator
 from pydantic import BaseModel
-from openai import OpenAI
-from anthropic import Anthropic
-
-from schemas import TurnOutput
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from anthropic import Anthropic, AsyncAnthropic
+from anthropic import DefaultHttpxClient as AnthropicHttpxClient, DefaultAsyncHttpxClient as AnthropicAsyncHttpxClient
+
+from schemas import TurnOutput, GameState
+from mock_llm import MockLLM
+from cli_pool import CLIWorkerPool
+from metrics import LatencyStats, PromptCacheStats, ParseStats
+from retry_policy import ConfigError, RetryPolicy, TurnParseError, classify, is_bad_request
+from rate_limiter import governor
+from event_log import EventLog, render_history
+from json_extract import extract_payload, SpeechStream
+from structured_output import ANTHROPIC_TOOL, ANTHROPIC_TOOL_CHOICE, TURN_SCHEMA, anthropic_text, gemini_schema, openai_response_format
+from config import HTTP_MAX_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY, STREAM_SPEECH
+from config import TURN_DEADLINE, TURN_FALLBACK, HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, HEDGE_MIN_DELAY
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Ensure logs directory exists
-# This line will be moved into the class's __init__ method
+# CLI tool used for each provider in CLI mode
+CLI_COMMANDS = {
+    "openai": "codex",
+    "anthropic": "claude",
+    "google": "gemini",
+    "qwen": "qwen",
+    "ollama": "ollama",
+}
+
+# OpenRouter models that only cache at explicit cache_control breakpoints (others cache prefixes automatically)
+OPENROUTER_CACHE_CONTROL_PREFIXES = ("anthropic/", "google/")
+
+# A system prompt is plain text, or a list of blocks whose leading blocks are shared by every
+# player in the phase (rules + public log) and sent as cacheable prefix blocks.
+SystemPrompt = Union[str, List[str]]
+
+
+def prompt_text(system_prompt: SystemPrompt) -> str:
+    return system_prompt if isinstance(system_prompt, str) else "".join(system_prompt)
+
+# Appended to the turn prompt for models without any JSON mode
+JSON_REMINDER = "\n\nProvide your response in JSON format."
+
+# OpenAI-compatible APIs: provider -> (API key env var, base_url)
+OPENAI_COMPATIBLE_APIS = {
+    "openai": ("OPENAI_API_KEY", None),
+    "xai": ("XAI_API_KEY", "https://api.x.ai/v1"),
+    "groq": ("GROQ_API_KEY", "https://api.groq.com/openai/v1"),
+    "openrouter": ("OPENROUTER_API_KEY", "https://openrouter.ai/api/v1"),
+}
 
 class UnifiedLLMClient:
-    def __init__(self, debug: bool = True, log_dir: str = None):
+    def __init__(self, debug: bool = True, log_dir: str = None, events: Optional[EventLog] = None):
         self.debug = debug
         self.log_dir = log_dir
+        self.events = events  # Game event log; without one, calls go to <log_dir>/<player>_history.txt
         self.suppress_console = False  # Set True in human mode to hide debug prints
-        
-        # Initialize clients ONLY if keys are present (avoids error if using CLI only)
-        self.openai_client = None
-        if os.getenv("OPENAI_API_KEY"):
-            self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            
-        self.anthropic_client = None
-        if os.getenv("ANTHROPIC_API_KEY"):
-            self.anthropic_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        
+
         # Ensure log dir exists
         if self.debug and self.log_dir:
             os.makedirs(self.log_dir, exist_ok=True)
-            
-        # xAI (Grok)
-        self.xai_client = None
-        if os.getenv("XAI_API_KEY"):
-            self.xai_client = OpenAI(
-                api_key=os.getenv("XAI_API_KEY"),
-                base_url="https://api.x.ai/v1",
-            )
-        
-        # Groq (Llama)
-        self.groq_client = None
-        if os.getenv("GROQ_API_KEY"):
-            self.groq_client = OpenAI(
-                api_key=os.getenv("GROQ_API_KEY"),
-                base_url="https://api.groq.com/openai/v1",
-            )
 
-        # OpenRouter
-        self.openrouter_client = None
-        if os.getenv("OPENROUTER_API_KEY"):
-            self.openrouter_client = OpenAI(
-                api_key=os.getenv("OPENROUTER_API_KEY"),
-                base_url="https://openrouter.ai/api/v1",
-            )
+        # Per-call latency: "<provider>:api", "<provider>:client_init", "<cli>:cold/warm"
+        self.latency = LatencyStats()
+
+        # API clients are created lazily on first use (CLI-only rosters never build one) and then
+        # reused for every turn, so their keep-alive connection pools skip TCP/TLS setup.
+        self._clients: Dict[str, Any] = {}
+        self._clients_lock = threading.Lock()
+
+        # Mock (local stand-in, no network) - seeded at construction for reproducible games
+        self.mock = MockLLM()
+
+        # Warm CLI processes (reused across turns) + cold/warm latency stats
+        self.cli_pool = CLIWorkerPool(latency=self.latency)
+
+        # Backoff between failed attempts, chosen per error kind
+        self.retry_policy = RetryPolicy()
+
+        # Process-wide concurrency / rate limits per provider and model
+        self.governor = governor
+
+        # Async SDK clients for agenerate_turn, per event loop: their pooled connections belong to
+        # the loop that opened them. The engine runs its async batches on one loop (run_async).
+        self._async_clients = weakref.WeakKeyDictionary()  # loop -> {provider: client}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # Worker threads for blocking CLI calls made from the loop, grown to the largest batch
+        self._cli_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._cli_workers = 0
+
+        # Prompt tokens served from provider prompt caches, per provider
+        self.prompt_cache = PromptCacheStats()
+
+        # API models get the turn schema enforced natively (see structured_output.py);
+        # "provider/model" keys that rejected it fall back to JSON mode
+        self._schema_rejected = set()
+        # Parsed vs unparseable responses per model and output mode (each failure costs a retry)
+        self.parse_stats = ParseStats()
+
+    def _log_debug(self, player_name: str, turn_number: int, phase: str, prompt: str, response: str,
+                   output: Optional[TurnOutput] = None):
+        """Log one call. `output` is the already-parsed turn, so the log never parses the response again."""
+        parsed = output.model_dump() if output else None
+        if self.events:
+            # One queued event; the game's event log writer thread does the I/O
+            self.events.emit("llm", player=player_name, phase=phase, turn=turn_number, prompt=prompt,
+                             response=response, parsed=parsed)
+            return
 
-    def _log_debug(self, player_name: str, turn_number: int, phase: str, prompt: str, response: str):
         if not self.log_dir:
             return
-            
-        directory = self.log_dir
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            
-        filename = f"{directory}/{player_name}_history.txt"
-        
-        # Try to clean up the response for the log
-        log_response = response
-        try:
-            # Re-use simple parse logic to get the dict (simplified here to avoid circular dep with _parse_and_validate logic if we needed it, but logic is self contained)
-            # 1. Strip markdown
-            clean = response.replace("```json", "").replace("```", "").strip()
-            
-            # 2. Regex find
-            import re, json
-            match = re.search(r"(\{|\[).+(\}|\])", response, re.DOTALL)
-            
-            data = None
-            try:
-                data = json.loads(clean)
-            except:
-                if match:
-                    data = json.loads(match.group(0))
-
-            if data:
-                # Handle wrappers (CLI list/dict)
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and "result" in item and isinstance(item["result"], str):
-                            data = json.loads(item["result"].replace("```json", "").replace("```", "").strip())
-                            break
-                elif isinstance(data, dict) and "result" in data and isinstance(data["result"], str):
-                    data = json.loads(data["result"].replace("```json", "").replace("```", "").strip())
-                
-                # Now data should be the TurnOutput dict
-                if "strategy" in data: # Basic check
-                    log_response = (
-                        f"STRATEGY: {data.get('strategy')}\n"
-                        f"SPEECH:   {data.get('speech')}\n"
-                        f"VOTE:     {data.get('vote')}"
-                    )
-        except:
-            pass # Keep raw if any parse error during logging
-
+        os.makedirs(self.log_dir, exist_ok=True)
+        filename = f"{self.log_dir}/{player_name}_history.txt"
         with open(filename, "a", encoding="utf-8") as f:
-            f.write(f"\n--- {phase} {turn_number} ---\nPROMPT:\n{prompt}\n\nRESPONSE:\n{log_response}\n\n" + "-"*80 + "\n")
-
-    def _repair_json(self, text: str) -> str:
-        """Attempt to fix common LLM JSON errors."""
-        import re
-        # Fix missing commas between string fields: "value"  "key" -> "value", "key"
-        # Pattern: end of string value followed by whitespace then start of new key
-        text = re.sub(r'"\s*\n\s*"', '",\n"', text)
-        text = re.sub(r'"\s+"(?=[a-zA-Z_])', '", "', text)
-        # Fix trailing commas before closing braces
-        text = re.sub(r',\s*}', '}', text)
-        text = re.sub(r',\s*]', ']', text)
-        return text
+            f.write(render_history({"phase": phase, "turn": turn_number, "prompt": prompt, "response": response,
+                                    "parsed": parsed}))
 
     def _parse_and_validate(self, response_text: str) -> TurnOutput:
-        """Attempts to parse JSON from the response and validate against TurnOutput schema."""
+        """Extracts the turn JSON from the response (see json_extract.py) and validates it against TurnOutput."""
         try:
-            # 1. Try generic strip of markdown
-            clean_text = response_text.replace("```json", "").replace("```", "").strip()
-
-            # 2. Try Regex to find JSON object (handles headers/logs) or list
-            import re
-            # Match either object {...} OR list [...]
-            json_match = re.search(r"(\{|\[).+(\}|\])", response_text, re.DOTALL)
-
-            # Let's try to parse whatever text we have as JSON first
-            data = None
-            try:
-                data = json.loads(clean_text)
-            except:
-                # Try repair before giving up
-                repaired = self._repair_json(clean_text)
-                try:
-                    data = json.loads(repaired)
-                except:
-                    if json_match:
-                        clean_text = self._repair_json(json_match.group(0))
-                        data = json.loads(clean_text)
-                    else:
-                        raise
-
-            # 3. Handle CLI Wrapper Formats
-            
-            # Case A: List output (Qwen CLI)
-            if isinstance(data, list):
-                # Search for the "result" object in the list
-                found_result = False
-                for item in data:
-                    if isinstance(item, dict) and "result" in item and isinstance(item["result"], str):
-                        # Found it!
-                        clean_text = item["result"]
-                        clean_text = clean_text.replace("```json", "").replace("```", "").strip()
-                        data = json.loads(clean_text)
-                        found_result = True
-                        break
-                
-                if not found_result and not self.suppress_console:
-                    print("Debug: JSON List returned but no 'result' field found.")
-                    # fallback, maybe the text was just a list? (Unlikely for TurnOutput)
-
-            # Case B: Nested "result" field in dict (Claude CLI)
-            elif isinstance(data, dict):
-                if "result" in data and isinstance(data["result"], str):
-                    inner_text = data["result"]
-                    # Clean markdown
-                    inner_text = inner_text.replace("```json", "").replace("```", "").strip()
-                    
-                    # Try regex again on inner text because it might have emojis/prefixes (like 🤖)
-                    inner_match = re.search(r"\{.*\}", inner_text, re.DOTALL)
-                    if inner_match:
-                        inner_text = inner_match.group(0)
-                        
-                    data = json.loads(inner_text)
-            
-            return TurnOutput(**data)
-
-        except (json.JSONDecodeError, Exception) as e:
-            # Fallback or error handling could go here. For now, re-raise or return a dummy fail.
+            return TurnOutput(**extract_payload(response_text))
+        except Exception as e:
             if not self.suppress_console:
                 print(f"Error parsing JSON: {e}")
                 print(f"Raw received: {response_text}")
-            # Try to recover partial? No, strictly fail for now to catch issues early.
-            raise ValueError(f"Failed to parse model output as JSON: {e}")
-
-    def _call_cli(self, command: str, model: str, prompt: str) -> str:
-        """Executes a local terminal command for the model."""
-        import subprocess
-        
-        # Construct command based on tool specific syntax
-        cmd = []
-        stdin_input = None
-        
+            raise TurnParseError(f"Failed to parse model output as JSON: {e}")
+
+    def _parse_turn(self, provider: str, model_name: str, use_cli: bool, response_text: str) -> TurnOutput:
+        """_parse_and_validate, counted in parse_stats under the model and its output mode."""
+        mode = self.output_mode(provider, model_name, use_cli)
+        try:
+            output = self._parse_and_validate(response_text)
+        except TurnParseError:
+            self.parse_stats.record(f"{provider}/{model_name}", mode, failed=True)
+            raise
+        self.parse_stats.record(f"{provider}/{model_name}", mode, failed=False)
+        return output
+
+    def _build_cli_command(self, command: str, model: str, prompt: Optional[str],
+                           stream: bool = False) -> Tuple[List[str], Optional[str]]:
+        """Returns (argv, stdin_input). Warm-capable CLIs take the prompt via stdin so spares can be pre-spawned.
+
+        stream=True asks the Claude CLI for incremental stream-json events instead of one JSON result.
+        """
+        via_stdin = self.cli_pool.supports_warm(command)
+
         if command == "codex":
-            # codex exec --model <model> <prompt>
-            cmd = ["codex", "exec", "--model", model, prompt]
-            
+            # codex exec --model <model> <prompt>  ("-" = read prompt from stdin)
+            cmd = ["codex", "exec", "--model", model] + (["-"] if via_stdin else [prompt])
+
         elif command == "claude":
             # claude --print --output-format json --model <model> (prompt via stdin)
             # We pass prompt via stdin to avoid ARG_MAX limits on large history
-            cmd = ["claude", "--print", "--output-format", "json", "--model", model]
-            stdin_input = prompt
-            
+            if stream:
+                return ["claude", "--print", "--output-format", "stream-json", "--verbose",
+                        "--include-partial-messages", "--model", model], prompt
+            return ["claude", "--print", "--output-format", "json", "--model", model], prompt
+
         elif command == "gemini":
             # gemini --model <model> <prompt>
-            cmd = ["gemini", "--model", model, prompt]
-            
+            cmd = ["gemini", "--model", model] + ([] if via_stdin else [prompt])
+
         elif command == "qwen":
             # qwen --output-format json --model <model> <prompt>
-            cmd = ["qwen", "--output-format", "json", "--model", model, prompt]
+            cmd = ["qwen", "--output-format", "json", "--model", model] + ([] if via_stdin else [prompt])
 
         elif command == "ollama":
             # ollama run --format json --hidethinking <model> <prompt>
-            cmd = ["ollama", "run", "--format", "json", "--hidethinking", model, prompt]
+            return ["ollama", "run", "--format", "json", "--hidethinking", model, prompt], None
 
         else:
             # Fallback
-            cmd = [command, "--model", model, prompt]
-        
-        # Prepare stdin
-        run_kwargs = {
-             "capture_output": True,
-             "text": True,
-             "check": True
-        }
-        
-        if stdin_input is not None:
-            run_kwargs["input"] = stdin_input
-        else:
-            run_kwargs["stdin"] = subprocess.DEVNULL
-        
+            return [command, "--model", model, prompt], None
+
+        return cmd, (prompt if via_stdin else None)
+
+    def prewarm(self, provider: str, model_name: str, use_cli: bool = True):
+        """Boot warm CLI spares for a player before its first turn."""
+        command = CLI_COMMANDS.get(provider)
+        if use_cli and command and self.cli_pool.supports_warm(command):
+            cmd, _ = self._build_cli_command(command, model_name, None, stream=self._streams_cli(command))
+            self.cli_pool.prewarm(cmd)
+
+    def latency_report(self) -> List[str]:
+        return self.latency.report_lines()
+
+    def parse_report(self) -> List[str]:
+        return self.parse_stats.report_lines()
+
+    def prompt_cache_report(self) -> List[str]:
+        return self.prompt_cache.report_lines()
+
+    def _system_content(self, provider: str, model_name: str, system_prompt: SystemPrompt):
+        """System prompt in the form that lets the provider cache the shared prefix.
+
+        Anthropic (and Anthropic/Gemini models on OpenRouter) cache only at cache_control
+        breakpoints, so each shared block ends with one. OpenAI, Gemini and the other
+        OpenAI-compatible APIs cache the longest repeated prefix on their own, so they get
+        the blocks joined as text with the shared prefix first.
+        """
+        if isinstance(system_prompt, str):
+            return system_prompt
+        explicit = provider == "anthropic" or (
+            provider == "openrouter" and model_name.startswith(OPENROUTER_CACHE_CONTROL_PREFIXES))
+        if not explicit:
+            return prompt_text(system_prompt)
+        blocks = [{"type": "text", "text": block} for block in system_prompt if block]
+        for block in blocks[:-1][-3:]:  # Anthropic allows 4 breakpoints per request
+            block["cache_control"] = {"type": "ephemeral"}
+        return blocks
+
+    def _record_usage(self, provider: str, response):
+        """Prompt tokens and cache-read tokens from a response's usage block, if it has one."""
         try:
-            # Run command
-            result = subprocess.run(cmd, **run_kwargs)
-            return result.stdout
+            if provider == "anthropic":
+                usage = response.usage
+                cached = usage.cache_read_input_tokens or 0
+                total = usage.input_tokens + cached + (usage.cache_creation_input_tokens or 0)
+            elif provider == "google":
+                usage = response.usage_metadata
+                total, cached = usage.prompt_token_count or 0, usage.cached_content_token_count or 0
+            else:
+                usage = response.usage
+                details = getattr(usage, "prompt_tokens_details", None)
+                total, cached = usage.prompt_tokens or 0, getattr(details, "cached_tokens", None) or 0
+        except AttributeError:
+            return  # Provider did not report usage
+        self.prompt_cache.record(provider, total, cached)
+
+    def close(self):
+        self.cli_pool.close()
+        for client in self._clients.values():
+            if hasattr(client, "close"):
+                try:
+                    client.close()
+                except Exception:
+                    pass
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._aclose_clients(), loop).result(timeout=5)
+            except Exception:
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+        if self._cli_executor is not None:
+            self._cli_executor.shutdown(wait=False)
+
+    async def _aclose_clients(self):
+        for client in self._async_clients.pop(asyncio.get_running_loop(), {}).values():
+            close = getattr(client, "close", None) or getattr(client, "aclose", None)
+            if close:
+                try:
+                    await close()
+                except Exception:
+                    pass
+
+    def submit_async(self, coro, workers: int = 1) -> concurrent.futures.Future:
+        """Schedule a coroutine (e.g. an agenerate_turn call) on the client's event loop thread.
+
+        The loop lives as long as the client, so async SDK clients and their connection pools are
+        reused across batches. `workers` is the number of calls in the batch: the CLI thread pool
+        grows to match, so blocking CLI calls are not throttled below the governor's limits.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-loop", daemon=True).start()
+            if workers > self._cli_workers:
+                old, self._cli_workers = self._cli_executor, workers
+                self._cli_executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-cli")
+                if old is not None:
+                    old.shutdown(wait=False)  # Calls already running on it finish normally
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run_async(self, coro, workers: int = 1):
+        """submit_async and wait for the result."""
+        return self.submit_async(coro, workers).result()
+
+    def run_async_as_completed(self, coros: Iterable) -> Iterator:
+        """Run coroutines concurrently on the client's loop and yield each result on the caller's
+        thread as soon as it is ready, in completion order (raises if the coroutine raised)."""
+        coros = list(coros)
+        done = queue.SimpleQueue()
+
+        async def start_all():
+            # All started in one loop step, in order: each builds its prompt before any result is
+            # handed back (and logged), and equal-latency calls (e.g. mock players) finish in order
+            tasks = [asyncio.ensure_future(coro) for coro in coros]
+            for task in tasks:
+                task.add_done_callback(done.put)
+            return tasks
+
+        tasks = self.run_async(start_all(), len(coros))  # Held so the loop cannot drop them
+        for _ in tasks:
+            yield done.get().result()
+
+    def _streams_cli(self, command: str) -> bool:
+        """Whether sync calls of this CLI use its streaming output (same argv for every turn, so spares match)."""
+        return STREAM_SPEECH and command == "claude"
+
+    def _call_cli(self, command: str, model: str, prompt: str, timeout: Optional[float] = None,
+                  on_text: Optional[Callable[[str], None]] = None, cancel: Optional[threading.Event] = None) -> str:
+        """Executes a local terminal command for the model. Setting `cancel` kills the process."""
+        if command == "ollama":
+            # Local server keeps the model loaded between turns; fall back to the CLI if it is not reachable
+            try:
+                return self.cli_pool.run_ollama(model, prompt, timeout, TURN_SCHEMA)
+            except TimeoutError:
+                raise
+            except (urllib.error.URLError, OSError):
+                pass
+
+        stream = self._streams_cli(command)
+        cmd, stdin_input = self._build_cli_command(command, model, prompt, stream=stream)
+
+        try:
+            if stream:
+                # stream-json prints one event per line; text deltas go to on_text as they arrive
+                results = []
+                stdout = self.cli_pool.run_stream(command, cmd, stdin_input,
+                                                  lambda line: self._on_cli_event(line, results, on_text), timeout,
+                                                  cancel)
+                # The final "result" event has the same shape as --output-format json
+                return results[-1] if results else stdout
+            # Run command (warm spare if one is idle)
+            return self.cli_pool.run(command, cmd, stdin_input, timeout, cancel)
         except subprocess.CalledProcessError as e:
             # If command not found or fails
             if not self.suppress_console:
                 print(f"CLI Error ({command}): {e.stderr}")
             raise e
 
-    def generate_turn(self, player_name: str, provider: str, model_name: str, system_prompt: str, turn_prompt: str, turn_number: int, phase: str = "Day", use_cli: bool = True) -> TurnOutput:
-
-        full_prompt = f"{system_prompt}\n\n{turn_prompt}"
+    def _on_cli_event(self, line: str, results: List[str], on_text: Optional[Callable[[str], None]]):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(event, dict):
+            return
+        if event.get("type") == "result":
+            results.append(line)
+        elif on_text and event.get("type") == "stream_event":
+            inner = event.get("event") or {}
+            delta = inner.get("delta") or {}
+            if inner.get("type") == "content_block_delta" and delta.get("type") == "text_delta":
+                on_text(delta.get("text", ""))
+
+    def _request_text(self, player_name: str, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str,
+                      turn_number: int, phase: str, use_cli: bool, game_state: Optional[GameState],
+                      timeout: Optional[float] = None, on_text: Optional[Callable[[str], None]] = None,
+                      cancel: Optional[threading.Event] = None) -> str:
+        """One raw model call (mock, CLI or API). Returns the response text.
+
+        on_text, if given, receives the response text in chunks as it streams in. Setting `cancel`
+        kills a running CLI process.
+        """
+        if provider == "mock":
+            # --- MOCK MODE (load testing, reads the live GameState) ---
+            text = self.mock.generate(player_name, phase, turn_number, prompt_text(system_prompt), turn_prompt, game_state)
+            if on_text:
+                on_text(text)
+            return text
+
+        if use_cli:
+            # --- CLI MODE ---
+            cli_command = CLI_COMMANDS.get(provider)
+            if not cli_command:
+                raise ConfigError(f"No CLI tool mapped for provider {provider}")
+            return self._call_cli(cli_command, model_name, f"{prompt_text(system_prompt)}\n\n{turn_prompt}", timeout,
+                                  on_text, cancel)
+
+        # --- API MODE ---
+        start = time.monotonic()
+        response_text = self._call_api(provider, model_name, system_prompt, turn_prompt, timeout, on_text)
+        self.latency.record(f"{provider}:api", time.monotonic() - start)
+        return response_text
+
+    def _create_client(self, provider: str, use_async: bool = False):
+        """Build an SDK client with a shared keep-alive connection pool."""
+        limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                              max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                              keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+
+        if provider in OPENAI_COMPATIBLE_APIS:
+            env_var, base_url = OPENAI_COMPATIBLE_APIS[provider]
+            if not os.getenv(env_var):
+                raise ConfigError(f"{env_var} is not set (needed for {provider} API mode)")
+            if use_async:
+                return AsyncOpenAI(api_key=os.getenv(env_var), base_url=base_url,
+                                   http_client=DefaultAsyncHttpxClient(limits=limits))
+            return OpenAI(api_key=os.getenv(env_var), base_url=base_url,
+                          http_client=DefaultHttpxClient(limits=limits))
+
+        if provider == "anthropic":
+            if not os.getenv("ANTHROPIC_API_KEY"):
+                raise ConfigError("ANTHROPIC_API_KEY is not set (needed for anthropic API mode)")
+            if use_async:
+                return AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"),
+                                      http_client=AnthropicAsyncHttpxClient(limits=limits))
+            return Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"),
+                             http_client=AnthropicHttpxClient(limits=limits))
+
+        if provider == "google":
+            if not os.getenv("GEMINI_API_KEY"):
+                raise ConfigError("GEMINI_API_KEY is not set (needed for google API mode)")
+            # google-genai keeps its own pooled httpx client per Client instance
+            from google import genai
+            client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+            return client.aio if use_async else client
+
+        raise ConfigError(f"Unknown provider: {provider}")
+
+    def _client(self, provider: str):
+        """Sync SDK client for a provider, created once and reused across turns and threads."""
+        client = self._clients.get(provider)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(provider)
+                if client is None:
+                    start = time.monotonic()
+                    client = self._create_client(provider)
+                    self.latency.record(f"{provider}:client_init", time.monotonic() - start)
+                    self._clients[provider] = client
+        return client
+
+    def _reject_schema(self, key: str, error: Exception):
+        """Remember a model that refused the structured-output request; it gets JSON mode from now on."""
+        self._schema_rejected.add(key)
+        if not self.suppress_console:
+            print(f"[Structured Output] {key} rejected the turn schema, using JSON mode: {error}")
+
+    def output_mode(self, provider: str, model_name: str, use_cli: bool) -> str:
+        """How a model's output format is enforced: schema, json, text, cli or mock."""
+        if provider == "mock":
+            return "mock"
+        if use_cli:
+            return "cli"
+        if f"{provider}/{model_name}" not in self._schema_rejected:
+            return "schema"
+        return "text" if provider in ("openrouter", "anthropic") else "json"
+
+    def _chat_request(self, provider: str, model_name: str, system, turn_prompt: str,
+                      structured: Optional[bool]) -> dict:
+        """chat.completions arguments: JSON schema (structured), JSON mode (False) or free text (None)."""
+        request = dict(model=model_name, messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": turn_prompt},
+        ])
+        if structured:
+            request["response_format"] = openai_response_format()
+        elif structured is not None and provider != "openrouter":
+            # OpenRouter has no JSON mode that works across its models
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def _anthropic_request(self, model_name: str, system, turn_prompt: str, structured: bool) -> dict:
+        request = dict(model=model_name, max_tokens=1024, system=system,
+                       messages=[{"role": "user", "content": turn_prompt}])
+        if structured:
+            # Forced tool call: the tool input is validated against the turn schema
+            request.update(tools=[ANTHROPIC_TOOL], tool_choice=ANTHROPIC_TOOL_CHOICE)
+        return request
+
+    def _google_config(self, system, timeout: Optional[float], structured: bool):
+        from google.genai import types
+        return types.GenerateContentConfig(
+            system_instruction=system,
+            response_mime_type="application/json",
+            response_schema=gemini_schema() if structured else None,
+            http_options=types.HttpOptions(timeout=int(timeout * 1000)) if timeout else None
+        )
+
+    def _chat(self, client, provider: str, on_text: Optional[Callable[[str], None]], **kwargs) -> str:
+        """chat.completions call for OpenAI-compatible APIs, streamed when on_text is given."""
+        if on_text is None:
+            response = client.chat.completions.create(**kwargs)
+            self._record_usage(provider, response)
+            return response.choices[0].message.content
+
+        parts = []
+        for chunk in client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                on_text(parts[-1])
+            if getattr(chunk, "usage", None):
+                # Usage arrives on the final chunk
+                self._record_usage(provider, chunk)
+        return "".join(parts)
+
+    def _call_api(self, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str,
+                  timeout: Optional[float] = None, on_text: Optional[Callable[[str], None]] = None) -> str:
+        """API call with the provider's native structured output (JSON mode for models that reject the schema)."""
+        key = f"{provider}/{model_name}"
+        if key not in self._schema_rejected:
+            try:
+                return self._call_api_once(provider, model_name, system_prompt, turn_prompt, timeout, on_text, True)
+            except Exception as e:
+                if not is_bad_request(e):
+                    raise
+                self._reject_schema(key, e)
+        return self._call_api_once(provider, model_name, system_prompt, turn_prompt, timeout, on_text, False)
+
+    def _call_api_once(self, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str,
+                       timeout: Optional[float], on_text: Optional[Callable[[str], None]], structured: bool) -> str:
+        client = self._client(provider)
+        if timeout and provider != "google":
+            # Per-request copy that shares the pooled connections
+            client = client.with_options(timeout=timeout)
+        system = self._system_content(provider, model_name, system_prompt)
+
+        if provider in OPENAI_COMPATIBLE_APIS:
+            request = self._chat_request(provider, model_name, system, turn_prompt, structured)
+            if provider == "xai" and not structured: # Grok
+                try:
+                    return self._chat(client, provider, on_text, **request)
+                except:
+                    request = self._chat_request(provider, model_name, system, turn_prompt + JSON_REMINDER, None)
+            return self._chat(client, provider, on_text, **request)
+
+        elif provider == "anthropic":
+            request = self._anthropic_request(model_name, system, turn_prompt, structured)
+            if on_text:
+                with client.messages.stream(**request) as stream:
+                    for event in stream:
+                        if event.type == "text":
+                            on_text(event.text)
+                        elif event.type == "input_json":
+                            on_text(event.partial_json)
+                    response = stream.get_final_message()
+            else:
+                response = client.messages.create(**request)
+            self._record_usage(provider, response)
+            return anthropic_text(response)
+
+        elif provider == "google":
+            request = dict(model=model_name, contents=turn_prompt,
+                           config=self._google_config(system, timeout, structured))
+            if on_text:
+                parts, response = [], None
+                for response in client.models.generate_content_stream(**request):
+                    if response.text:
+                        parts.append(response.text)
+                        on_text(parts[-1])
+                if response is not None:
+                    # The last chunk carries the usage metadata
+                    self._record_usage(provider, response)
+                return "".join(parts)
+            response = client.models.generate_content(**request)
+            self._record_usage(provider, response)
+            return response.text
+        else:
+            raise ConfigError(f"Unknown provider: {provider}")
+
+    def generate_turn(self, player_name: str, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str, turn_number: int, phase: str = "Day", use_cli: bool = True, game_state: Optional[GameState] = None,
+                      on_speech: Optional[Callable[[str], None]] = None) -> TurnOutput:
+        """One validated turn. on_speech(speech) is called as soon as the "speech" field has streamed in,
+        before the rest of the response (it can fire again for a retry or hedged request, but not once the
+        turn has been resolved)."""
+        full_prompt = f"{prompt_text(system_prompt)}\n\n{turn_prompt}"
         # print(f"🔄 [{player_name}] Sending prompt to {provider}/{model_name}...")
 
-        max_retries = 3
-        last_exception = None
+        args = (player_name, provider, model_name, system_prompt, turn_prompt, turn_number, phase, use_cli, game_state,
+                on_speech)
+        start = time.monotonic()
+        deadline = start + TURN_DEADLINE if TURN_DEADLINE else None
+        hedge_after = self._hedge_delay(provider, model_name)
+
+        if deadline is None and hedge_after is None:
+            return self._generate_with_retries(*args, deadline=None)
 
-        for attempt in range(max_retries):
+        # Attempts run on daemon threads so a stuck call cannot hold the game past the deadline.
+        # Each has a cancel event: once the turn is resolved, losers stop retrying and streaming.
+        cancels = []
+        try:
+            return self._race_attempts(args, start, deadline, hedge_after, cancels, full_prompt)
+        finally:
+            for cancel in cancels:
+                cancel.set()
+
+    def _race_attempts(self, args: tuple, start: float, deadline: Optional[float], hedge_after: Optional[float],
+                       cancels: List[threading.Event], full_prompt: str) -> TurnOutput:
+        """First successful attempt wins; a hedged attempt is added once the turn is slower than hedge_after."""
+        player_name, provider, model_name, turn_number, phase = args[0], args[1], args[2], args[5], args[6]
+        pending = {self._start_attempt(*args, deadline=deadline, cancels=cancels)}
+        last_error = None
+        while pending:
+            now = time.monotonic()
+            waits = []
+            if deadline is not None:
+                waits.append(max(0.0, deadline - now))
+            if hedge_after is not None:
+                waits.append(max(0.0, start + hedge_after - now))
+            done, pending = concurrent.futures.wait(pending, timeout=min(waits) if waits else None,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if pending and hedge_after is not None and time.monotonic() - start >= hedge_after:
+                # Hedge: a second identical request; whichever answers first wins
+                hedge_after = None
+                self._note_hedge(player_name, provider, model_name, time.monotonic() - start)
+                pending.add(self._start_attempt(*args, deadline=deadline, cancels=cancels))
+
+        if pending:
+            return self._deadline_output(player_name, phase, turn_number, full_prompt)
+        raise last_error
+
+    def _start_attempt(self, *args, deadline: Optional[float], cancels: List[threading.Event]) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        cancel = threading.Event()
+        cancels.append(cancel)
+
+        def run():
+            try:
+                future.set_result(self._generate_with_retries(*args, deadline=deadline, cancel=cancel))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def _generate_with_retries(self, player_name: str, provider: str, model_name: str, system_prompt: SystemPrompt,
+                               turn_prompt: str, turn_number: int, phase: str, use_cli: bool,
+                               game_state: Optional[GameState], on_speech: Optional[Callable[[str], None]],
+                               deadline: Optional[float], cancel: Optional[threading.Event] = None) -> TurnOutput:
+        """Call + parse with the retry policy. Every call is given the time left until the deadline.
+
+        Setting `cancel` stops the attempt between retries and aborts a streaming response.
+        """
+        full_prompt = f"{prompt_text(system_prompt)}\n\n{turn_prompt}"
+        failures = {}  # error kind -> count, drives the retry policy
+
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise concurrent.futures.CancelledError()
             response_text = ""
+            # Fresh per attempt, so a retried response can report its own speech
+            on_text = self._speech_feed(on_speech, cancel) if on_speech else None
             try:
-                if use_cli:
-                    # --- CLI MODE ---
-                    cli_command = None
-                    if provider == "openai":
-                        cli_command = "codex"
-                    elif provider == "anthropic":
-                        cli_command = "claude"
-                    elif provider == "google":
-                        cli_command = "gemini"
-                    elif provider == "qwen":
-                        cli_command = "qwen"
-                    elif provider == "ollama":
-                        cli_command = "ollama" 
-
-                    if cli_command:
-                        response_text = self._call_cli(cli_command, model_name, full_prompt)
-                    else:
-                        raise ValueError(f"No CLI tool mapped for provider {provider}")
-
-                else:
-                    # --- API MODE ---
-                    if provider == "openai":
-                        response = self.openai_client.chat.completions.create(
-                            model=model_name,
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": turn_prompt}
-                            ],
-                            response_format={"type": "json_object"}
-                        )
-                        response_text = response.choices[0].message.content
-
-                    elif provider == "xai": # Grok
-                        model = model_name
-                        try:
-                            response = self.xai_client.chat.completions.create(
-                                model=model,
-                                messages=[
-                                    {"role": "system", "content": system_prompt},
-                                    {"role": "user", "content": turn_prompt}
-                                ],
-                                response_format={"type": "json_object"}
-                            )
-                        except:
-                             response = self.xai_client.chat.completions.create(
-                                model=model,
-                                messages=[
-                                    {"role": "system", "content": system_prompt},
-                                    {"role": "user", "content": turn_prompt + "\n\nProvide your response in JSON format."}
-                                ]
-                            )
-                        response_text = response.choices[0].message.content
-
-                    elif provider == "groq":
-                        response = self.groq_client.chat.completions.create(
-                            model=model_name,
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": turn_prompt},
-                            ],
-                            response_format={"type": "json_object"}
-                        )
-                        response_text = response.choices[0].message.content
-
-                    elif provider == "openrouter":
-                        response = self.openrouter_client.chat.completions.create(
-                            model=model_name,
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": turn_prompt},
-                            ],
-                        )
-                        response_text = response.choices[0].message.content
-
-                    elif provider == "anthropic":
-                        response = self.anthropic_client.messages.create(
-                            model=model_name,
-                            max_tokens=1024,
-                            system=system_prompt,
-                            messages=[
-                                {"role": "user", "content": turn_prompt}
-                            ]
-                        )
-                        response_text = response.content[0].text
-
-                    elif provider == "google":
-                        from google import genai
-                        from google.genai import types
-                        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-                        response = client.models.generate_content(
-                            model=model_name,
-                            contents=turn_prompt,
-                            config=types.GenerateContentConfig(
-                                system_instruction=system_prompt,
-                                response_mime_type="application/json"
-                            )
-                        )
-                        response_text = response.text
+                with self.governor.slot(provider, model_name):
+                    start = time.monotonic()
+                    response_text = self._request_text(player_name, provider, model_name, system_prompt, turn_prompt,
+                                                       turn_number, phase, use_cli, game_state,
+                                                       self._time_left(deadline), on_text, cancel)
+                    self.latency.record(f"turn:{provider}/{model_name}", time.monotonic() - start)
+
+                # Parse, then log the response together with the parsed turn
+                try:
+                    output = self._parse_turn(provider, model_name, use_cli, response_text)
+                except TurnParseError:
+                    self._log_debug(player_name, turn_number, phase, full_prompt, response_text)
+                    raise
+                self._log_debug(player_name, turn_number, phase, full_prompt, response_text, output)
+                return output
+
+            except concurrent.futures.CancelledError:
+                raise
+            except Exception as e:
+                delay = self._on_failure(e, failures, player_name, turn_number, phase, full_prompt, deadline)
+                if delay is None:
+                    raise
+                if delay:
+                    # Wakes up early when the attempt is cancelled
+                    if cancel is not None:
+                        cancel.wait(delay)
                     else:
-                        raise ValueError(f"Unknown provider: {provider}")
-
-                # Debug Log
-                self._log_debug(player_name, turn_number, phase, full_prompt, response_text)
-
-                # Parse
-                return self._parse_and_validate(response_text)
+                        time.sleep(delay)
+
+    @staticmethod
+    def _speech_feed(on_speech: Callable[[str], None], cancel: Optional[threading.Event]) -> Callable[[str], None]:
+        """on_text for one attempt: extracts the speech for on_speech until the attempt is cancelled."""
+        feed = SpeechStream(on_speech).feed
+        if cancel is None:
+            return feed
+
+        def on_text(chunk: str):
+            if cancel.is_set():
+                raise concurrent.futures.CancelledError()  # Stops reading (and paying for) the stream
+            feed(chunk)
+        return on_text
+
+    def _time_left(self, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise TimeoutError("Turn deadline passed")
+        return left
+
+    def _hedge_delay(self, provider: str, model_name: str) -> Optional[float]:
+        """Seconds after which a turn for this model gets a hedged second request, or None."""
+        if not HEDGE_PERCENTILE or provider == "mock":
+            return None
+        key = f"turn:{provider}/{model_name}"
+        if self.latency.count(key) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, self.latency.percentile(key, HEDGE_PERCENTILE))
+
+    def _note_hedge(self, player_name: str, provider: str, model_name: str, elapsed: float):
+        self.latency.record(f"hedge:{provider}/{model_name}", elapsed)
+        if not self.suppress_console:
+            print(f"⏱️  {player_name} is slow ({elapsed:.1f}s) - sending a hedged request")
+
+    def _deadline_output(self, player_name: str, phase: str, turn_number: int, full_prompt: str) -> TurnOutput:
+        """Turn used when a player misses TURN_DEADLINE. Reflection keeps the old memory instead."""
+        message = f"DEADLINE: no answer within {TURN_DEADLINE}s"
+        self._log_debug(player_name, turn_number, phase, full_prompt, message)
+        if not self.suppress_console:
+            print(f"⏱️  {player_name} missed the {TURN_DEADLINE}s turn deadline")
+        if TURN_FALLBACK is None or phase == "Reflection":
+            raise TimeoutError(message)
+        return TurnOutput(**TURN_FALLBACK)
+
+    def _on_failure(self, error: Exception, failures: Dict[str, int], player_name: str, turn_number: int,
+                    phase: str, full_prompt: str, deadline: Optional[float] = None) -> Optional[float]:
+        """Classify and log a failed attempt. Returns the wait before retrying, or None to give up."""
+        kind = classify(error)
+        failures[kind] = failures.get(kind, 0) + 1
+        attempt = sum(failures.values())
+        delay = self.retry_policy.next_delay(error, kind, failures)
+        if delay is not None and deadline is not None and time.monotonic() + delay >= deadline:
+            delay = None  # The retry could not finish before the turn deadline
+
+        # Log the failure too
+        self._log_debug(player_name, turn_number, phase, full_prompt, f"ERROR (Attempt {attempt}, {kind}): {str(error)}")
+
+        if not self.suppress_console:
+            next_step = "giving up" if delay is None else f"retrying in {delay:.1f}s"
+            print(f"⚠️  [Attempt {attempt}] {kind} error for {player_name} ({next_step}): {error}")
+        return delay
+
+    # --- ASYNC PATH ---
+    # Same prompts, parsing and retries as generate_turn, but on the async SDK clients and
+    # asyncio subprocesses, so many in-flight turns can share one event loop without a thread each.
+
+    def _async_client(self, provider: str):
+        """Async SDK client for a provider, shared by all coroutines on the running loop."""
+        clients = self._async_clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(provider)
+        if client is None:
+            start = time.monotonic()
+            client = self._create_client(provider, use_async=True)
+            self.latency.record(f"{provider}:client_init", time.monotonic() - start)
+            clients[provider] = client
+        return client
+
+    async def _acall_cli(self, command: str, model: str, prompt: str, timeout: Optional[float] = None) -> str:
+        """Async counterpart of _call_cli. Warm-capable CLIs go through the sync pool (in a worker thread),
+        so their spares are shared with the sync path; others are spawned cold as asyncio subprocesses.
+        Cancelling the coroutine kills the CLI process either way."""
+        if self.cli_pool.supports_warm(command):
+            cancel = threading.Event()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._cli_executor, self._call_cli, command, model, prompt, timeout, None, cancel)
+            except asyncio.CancelledError:
+                cancel.set()
+                raise
+        if command == "ollama":
+            try:
+                return await asyncio.to_thread(self.cli_pool.run_ollama, model, prompt, timeout, TURN_SCHEMA)
+            except TimeoutError:
+                raise
+            except (urllib.error.URLError, OSError):
+                pass
+
+        cmd, stdin_input = self._build_cli_command(command, model, prompt)
+        start = time.monotonic()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if stdin_input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(stdin_input.encode("utf-8") if stdin_input is not None else None), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            proc.kill()
+            await proc.wait()
+            raise
+        self.cli_pool.latency.record(f"{command}:cold", time.monotonic() - start)
+
+        stdout_text = stdout.decode("utf-8", errors="replace")
+        if proc.returncode != 0:
+            stderr_text = stderr.decode("utf-8", errors="replace")
+            if not self.suppress_console:
+                print(f"CLI Error ({command}): {stderr_text}")
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout_text, stderr=stderr_text)
+        return stdout_text
+
+    async def _acall_api(self, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str,
+                         timeout: Optional[float] = None) -> str:
+        """Async counterpart of _call_api (same schema fallback)."""
+        key = f"{provider}/{model_name}"
+        if key not in self._schema_rejected:
+            try:
+                return await self._acall_api_once(provider, model_name, system_prompt, turn_prompt, timeout, True)
+            except Exception as e:
+                if not is_bad_request(e):
+                    raise
+                self._reject_schema(key, e)
+        return await self._acall_api_once(provider, model_name, system_prompt, turn_prompt, timeout, False)
+
+    async def _acall_api_once(self, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str,
+                              timeout: Optional[float], structured: bool) -> str:
+        client = self._async_client(provider)
+        if timeout and provider != "google":
+            client = client.with_options(timeout=timeout)
+        system = self._system_content(provider, model_name, system_prompt)
+
+        if provider in OPENAI_COMPATIBLE_APIS:
+            request = self._chat_request(provider, model_name, system, turn_prompt, structured)
+            if provider == "xai" and not structured: # Grok
+                try:
+                    response = await client.chat.completions.create(**request)
+                except Exception:
+                    request = self._chat_request(provider, model_name, system, turn_prompt + JSON_REMINDER, None)
+                    response = await client.chat.completions.create(**request)
+            else:
+                response = await client.chat.completions.create(**request)
+            self._record_usage(provider, response)
+            return response.choices[0].message.content
+
+        elif provider == "anthropic":
+            response = await client.messages.create(**self._anthropic_request(model_name, system, turn_prompt, structured))
+            self._record_usage(provider, response)
+            return anthropic_text(response)
+
+        elif provider == "google":
+            response = await client.models.generate_content(
+                model=model_name, contents=turn_prompt, config=self._google_config(system, timeout, structured)
+            )
+            self._record_usage(provider, response)
+            return response.text
+
+        raise ConfigError(f"Unknown provider: {provider}")
+
+    async def _arequest_text(self, player_name: str, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str,
+                             turn_number: int, phase: str, use_cli: bool, game_state: Optional[GameState],
+                             timeout: Optional[float] = None) -> str:
+        """Async counterpart of _request_text."""
+        if provider == "mock":
+            return await self.mock.agenerate(player_name, phase, turn_number, prompt_text(system_prompt), turn_prompt, game_state)
+
+        if use_cli:
+            cli_command = CLI_COMMANDS.get(provider)
+            if not cli_command:
+                raise ConfigError(f"No CLI tool mapped for provider {provider}")
+            return await self._acall_cli(cli_command, model_name, f"{prompt_text(system_prompt)}\n\n{turn_prompt}", timeout)
+
+        start = time.monotonic()
+        response_text = await self._acall_api(provider, model_name, system_prompt, turn_prompt, timeout)
+        self.latency.record(f"{provider}:api", time.monotonic() - start)
+        return response_text
+
+    async def agenerate_turn(self, player_name: str, provider: str, model_name: str, system_prompt: SystemPrompt, turn_prompt: str, turn_number: int, phase: str = "Day", use_cli: bool = True, game_state: Optional[GameState] = None) -> TurnOutput:
+        """Coroutine version of generate_turn (same deadline, hedging and fallback; losing requests are cancelled)."""
+        full_prompt = f"{prompt_text(system_prompt)}\n\n{turn_prompt}"
+        args = (player_name, provider, model_name, system_prompt, turn_prompt, turn_number, phase, use_cli, game_state)
+        start = time.monotonic()
+        deadline = start + TURN_DEADLINE if TURN_DEADLINE else None
+        hedge_after = self._hedge_delay(provider, model_name)
+
+        if deadline is None and hedge_after is None:
+            return await self._agenerate_with_retries(*args, deadline=None)
+
+        pending = {asyncio.ensure_future(self._agenerate_with_retries(*args, deadline=deadline))}
+        last_error = None
+        try:
+            while pending:
+                now = time.monotonic()
+                waits = []
+                if deadline is not None:
+                    waits.append(max(0.0, deadline - now))
+                if hedge_after is not None:
+                    waits.append(max(0.0, start + hedge_after - now))
+                done, pending = await asyncio.wait(pending, timeout=min(waits) if waits else None,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if pending and hedge_after is not None and time.monotonic() - start >= hedge_after:
+                    hedge_after = None
+                    self._note_hedge(player_name, provider, model_name, time.monotonic() - start)
+                    pending.add(asyncio.ensure_future(self._agenerate_with_retries(*args, deadline=deadline)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            return self._deadline_output(player_name, phase, turn_number, full_prompt)
+        raise last_error
+
+    async def _agenerate_with_retries(self, player_name: str, provider: str, model_name: str, system_prompt: SystemPrompt,
+                                      turn_prompt: str, turn_number: int, phase: str, use_cli: bool,
+                                      game_state: Optional[GameState], deadline: Optional[float]) -> TurnOutput:
+        full_prompt = f"{prompt_text(system_prompt)}\n\n{turn_prompt}"
+        failures = {}
+
+        while True:
+            try:
+                async with self.governor.aslot(provider, model_name):
+                    start = time.monotonic()
+                    response_text = await self._arequest_text(player_name, provider, model_name, system_prompt, turn_prompt,
+                                                              turn_number, phase, use_cli, game_state,
+                                                              self._time_left(deadline))
+                    self.latency.record(f"turn:{provider}/{model_name}", time.monotonic() - start)
+                try:
+                    output = self._parse_turn(provider, model_name, use_cli, response_text)
+                except TurnParseError:
+                    self._log_debug(player_name, turn_number, phase, full_prompt, response_text)
+                    raise
+                self._log_debug(player_name, turn_number, phase, full_prompt, response_text, output)
+                return output
 
             except Exception as e:
-                last_exception = e
-                # Log the failure too
-                self._log_debug(player_name, turn_number, phase, full_prompt, f"ERROR (Attempt {attempt + 1}): {str(e)}")
-                
-                if not self.suppress_console:
-                    print(f"⚠️  [Attempt {attempt + 1}/{max_retries}] Error generating/parsing turn for {player_name}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(5)
-        
-        # If we get here, all retries failed
-        raise last_exception
+                delay = self._on_failure(e, failures, player_name, turn_number, phase, full_prompt, deadline)
+                if delay is None:
+                    raise
+                if delay:
+                    await asyncio.sleep(delay)
@@ -0,0 +1,79 @@
+# audio_backends.py - Audio playback backends for TTSEngine (macOS, Linux, or none)
+
+import os
+import sys
+import glob
+import shutil
+import subprocess
+from typing import List
+
+from config import AUDIO_BACKEND
+
+
+class AudioBackend:
+    """Plays an MP3 file to the end (blocking). Subclasses: CommandBackend, NullBackend."""
+    name = "base"
+    is_null = False
+
+    def play(self, path: str):
+        raise NotImplementedError
+
+
+class CommandBackend(AudioBackend):
+    """A command-line player, given the file path as its last argument."""
+
+    def __init__(self, name: str, argv: List[str]):
+        self.name = name
+        self.argv = argv
+
+    def available(self) -> bool:
+        return shutil.which(self.argv[0]) is not None
+
+    def play(self, path: str):
+        subprocess.run(self.argv + [path], check=True, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+class NullBackend(AudioBackend):
+    """No playback. Auto-detected, it turns TTSEngine speech off; passed explicitly, clips are still synthesized."""
+    name = "none"
+    is_null = True
+
+    def play(self, path: str):
+        pass
+
+
+# In order of preference. aplay is not listed: it only plays WAV/raw PCM, and Edge TTS sends MP3.
+BACKENDS = [
+    CommandBackend("afplay", ["afplay"]),                                         # macOS
+    CommandBackend("ffplay", ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"]),
+    CommandBackend("mpg123", ["mpg123", "-q"]),
+    CommandBackend("paplay", ["paplay"]),                                         # PulseAudio/PipeWire (libsndfile >= 1.1 reads MP3)
+]
+
+
+def has_audio_device() -> bool:
+    """Whether this host can output sound at all (a sound server or an ALSA playback device)."""
+    if sys.platform == "darwin":
+        return True
+    if os.environ.get("PULSE_SERVER"):
+        return True
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and any(os.path.exists(os.path.join(runtime_dir, socket)) for socket in ("pulse/native", "pipewire-0")):
+        return True
+    return bool(glob.glob("/dev/snd/pcmC*D*p"))
+
+
+def detect_backend(preference: str = AUDIO_BACKEND) -> AudioBackend:
+    """The backend named by preference, or with "auto" the first installed player.
+
+    NullBackend if the player is not installed, or (auto only) the host has no audio device.
+    """
+    if preference == "none":
+        return NullBackend()
+    named = [b for b in BACKENDS if b.name == preference]
+    if preference != "auto" and not named:
+        print(f"[TTS] Unknown AUDIO_BACKEND '{preference}', using auto-detection")
+    if not named and not has_audio_device():
+        return NullBackend()
+    return next((b for b in named or BACKENDS if b.available()), NullBackend())
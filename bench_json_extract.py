@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: json_extract.extract_payload vs the old multi-pass parser, on real model responses.
+
+Responses are read from the games/*.jsonl event logs ("llm" events) and logs/*_history.txt files.
+If there are none yet, a built-in set of typical response shapes is used.
+
+    python bench_json_extract.py                      # games/ and logs/ in the current directory
+    python bench_json_extract.py path/to/game.jsonl logs/3_Haiku_history.txt
+"""
+
+import re
+import sys
+import glob
+import json
+import time
+from typing import List
+
+from json_extract import extract_payload
+from schemas import TurnOutput
+
+_RESPONSE = re.compile(r"\nRESPONSE:\n(.*?)\n\n-{80}\n", re.DOTALL)
+
+SAMPLES = [
+    '{"strategy": "Push on Bot3, keep Bot5 close.", "speech": "Bot3, why so quiet?", "vote": null}',
+    '```json\n{"strategy": "Stay low.", "speech": "I trust Bot1 for now.", "vote": "Bot4",}\n```',
+    'Here is my move:\n{"strategy": "Bus the partner if needed"\n"speech": "I think it is Bot2." "vote": "Bot2"}',
+    json.dumps({"type": "result", "subtype": "success", "is_error": False, "duration_ms": 4211,
+                "result": "```json\n{\"strategy\": \"Defend.\", \"speech\": \"Not me.\", \"vote\": null}\n```",
+                "session_id": "0", "total_cost_usd": 0.01}),
+    json.dumps([{"type": "system", "subtype": "init"}, {"type": "assistant", "message": {"content": "..."}},
+                {"type": "result", "result": "🤖 {\"strategy\": \"Investigate Bot6.\", \"speech\": \"Hmm.\", \"vote\": \"Bot6\"}"}]),
+]
+
+
+def legacy_repair(text: str) -> str:
+    text = re.sub(r'"\s*\n\s*"', '",\n"', text)
+    text = re.sub(r'"\s+"(?=[a-zA-Z_])', '", "', text)
+    text = re.sub(r',\s*}', '}', text)
+    text = re.sub(r',\s*]', ']', text)
+    return text
+
+
+def legacy_parse(response_text: str):
+    """The parser _parse_and_validate used before json_extract (replace passes, greedy regex, up to 4 loads)."""
+    clean_text = response_text.replace("```json", "").replace("```", "").strip()
+    json_match = re.search(r"(\{|\[).+(\}|\])", response_text, re.DOTALL)
+    try:
+        data = json.loads(clean_text)
+    except:
+        try:
+            data = json.loads(legacy_repair(clean_text))
+        except:
+            if not json_match:
+                raise
+            data = json.loads(legacy_repair(json_match.group(0)))
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict) and "result" in item and isinstance(item["result"], str):
+                data = json.loads(item["result"].replace("```json", "").replace("```", "").strip())
+                break
+    elif isinstance(data, dict) and "result" in data and isinstance(data["result"], str):
+        inner_text = data["result"].replace("```json", "").replace("```", "").strip()
+        inner_match = re.search(r"\{.*\}", inner_text, re.DOTALL)
+        if inner_match:
+            inner_text = inner_match.group(0)
+        data = json.loads(inner_text)
+    return data
+
+
+def load_responses(paths: List[str]) -> List[str]:
+    responses = []
+    for path in paths:
+        if path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    event = json.loads(line)
+                    if event.get("type") == "llm" and not event["response"].startswith("ERROR ("):
+                        responses.append(event["response"])
+        else:
+            with open(path, encoding="utf-8") as f:
+                responses.extend(m.group(1) for m in _RESPONSE.finditer(f.read())
+                                 if not m.group(1).startswith(("STRATEGY:", "ERROR (")))
+    return responses
+
+
+def bench(parse, responses: List[str], rounds: int) -> float:
+    """Mean microseconds per response (turn validated as TurnOutput; failures count too)."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in responses:
+            try:
+                TurnOutput(**parse(text))
+            except Exception:
+                pass
+    return (time.perf_counter() - start) / (rounds * len(responses)) * 1e6
+
+
+def outcome(parse, text: str):
+    try:
+        return TurnOutput(**parse(text)).model_dump()
+    except Exception:
+        return None
+
+
+def main():
+    paths = sys.argv[1:] or glob.glob("games/*.jsonl") + glob.glob("logs/*_history.txt")
+    responses = load_responses(paths)
+    source = f"{len(responses)} responses from {len(paths)} files"
+    if not responses:
+        responses, source = SAMPLES, f"{len(SAMPLES)} built-in sample responses (no logs found)"
+    rounds = max(1, 20000 // len(responses))
+
+    old = [outcome(legacy_parse, text) for text in responses]
+    new = [outcome(extract_payload, text) for text in responses]
+    print(f"Corpus: {source}, {sum(map(len, responses)) // len(responses)} chars avg, {rounds} rounds")
+    print(f"Parsed: old {sum(o is not None for o in old)}, new {sum(n is not None for n in new)}, "
+          f"same result {sum(o == n for o, n in zip(old, new))}/{len(responses)}")
+
+    legacy = bench(legacy_parse, responses, rounds)
+    single = bench(extract_payload, responses, rounds)
+    print(f"old parser:   {legacy:8.1f} us/response")
+    print(f"json_extract: {single:8.1f} us/response  ({legacy / single:.1f}x)")
+    # The old logger parsed every response a second time to format the history
+    print(f"old parse + log re-parse vs new parse once: {2 * legacy:.1f} us vs {single:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# cli_pool.py - Warm CLI worker pool (pre-spawned processes waiting on stdin)
+
+import os
+import json
+import time
+import atexit
+import threading
+import subprocess
+import concurrent.futures
+import urllib.request
+import urllib.error
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import CLI_WARM_COMMANDS, CLI_WARM_SPARES, CLI_WARM_MAX_IDLE, OLLAMA_KEEP_ALIVE
+from metrics import LatencyStats
+
+
+class CLIWorkerPool:
+    """Keeps spare CLI processes booted and idle so a turn only pays for inference.
+
+    None of the supported CLIs can serve several independent prompts from one
+    process without leaking conversation context, so "warm" here means a spare
+    process spawned ahead of time: Node/Python startup and config loading happen
+    while it blocks on stdin, and the next turn for the same command line writes
+    its prompt straight in. A replacement spare is spawned as soon as one is taken.
+
+    Ollama is served over its local HTTP API with keep_alive instead, so the model
+    stays loaded and no process is spawned at all.
+    """
+
+    def __init__(self, spares: int = CLI_WARM_SPARES, max_idle: float = CLI_WARM_MAX_IDLE,
+                 warm_commands: List[str] = CLI_WARM_COMMANDS, latency: Optional[LatencyStats] = None):
+        self.spares = spares
+        self.max_idle = max_idle
+        self.warm_commands = set(warm_commands)
+        self.latency = latency if latency is not None else LatencyStats()
+        self._idle: Dict[Tuple[str, ...], List[Tuple[subprocess.Popen, float]]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def supports_warm(self, command: str) -> bool:
+        return self.spares > 0 and command in self.warm_commands
+
+    def _spawn(self, cmd: List[str]) -> subprocess.Popen:
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True)
+
+    def _take_spare(self, key: Tuple[str, ...]) -> Optional[subprocess.Popen]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                proc, spawned_at = idle.pop(0)
+                # Discard spares that died or sat idle long enough for auth/session state to go stale
+                if proc.poll() is None and now - spawned_at <= self.max_idle:
+                    return proc
+                self._kill(proc)
+        return None
+
+    def _replenish(self, key: Tuple[str, ...]):
+        with self._lock:
+            if self._closed:
+                return
+            idle = self._idle.setdefault(key, [])
+            while len(idle) < self.spares:
+                idle.append((self._spawn(list(key)), time.monotonic()))
+
+    def prewarm(self, cmd: List[str]):
+        """Boot spares for a command line before its first turn."""
+        if self.supports_warm(cmd[0]):
+            self._replenish(tuple(cmd))
+
+    def _start(self, command: str, cmd: List[str], stdin_input: Optional[str]) -> Tuple[subprocess.Popen, str]:
+        """A process for cmd (a warm spare if one is idle) and "warm"/"cold"."""
+        proc = None
+        kind = "cold"
+        if stdin_input is not None and self.supports_warm(command):
+            key = tuple(cmd)
+            proc = self._take_spare(key)
+            if proc:
+                kind = "warm"
+            # Start the next spare booting while this turn runs
+            self._replenish(key)
+
+        if proc is None:
+            if stdin_input is None:
+                proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, text=True)
+            else:
+                proc = self._spawn(cmd)
+        return proc, kind
+
+    def _kill_on_cancel(self, proc: subprocess.Popen, cancel: Optional[threading.Event]) -> threading.Event:
+        """Kill proc as soon as cancel is set. Set the returned event once proc has finished."""
+        finished = threading.Event()
+        if cancel is None:
+            return finished
+
+        def watch():
+            while not finished.is_set():
+                if cancel.wait(0.1):
+                    self._kill(proc)
+                    return
+        threading.Thread(target=watch, name="cli-cancel", daemon=True).start()
+        return finished
+
+    def run(self, command: str, cmd: List[str], stdin_input: Optional[str], timeout: Optional[float] = None,
+            cancel: Optional[threading.Event] = None) -> str:
+        """Run cmd and return stdout. Raises CalledProcessError on non-zero exit like subprocess.run(check=True).
+
+        Setting `cancel` kills the process; the call then raises CancelledError.
+        """
+        start = time.monotonic()
+        proc, kind = self._start(command, cmd, stdin_input)
+        finished = self._kill_on_cancel(proc, cancel)
+        try:
+            stdout, stderr = proc.communicate(input=stdin_input, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(proc)
+            raise
+        finally:
+            finished.set()
+        if cancel is not None and cancel.is_set():
+            raise concurrent.futures.CancelledError()
+        self.latency.record(f"{command}:{kind}", time.monotonic() - start)
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+        return stdout
+
+    def run_stream(self, command: str, cmd: List[str], stdin_input: Optional[str], on_line: Callable[[str], None],
+                   timeout: Optional[float] = None, cancel: Optional[threading.Event] = None) -> str:
+        """Like run, but hands each stdout line to on_line as soon as the process prints it."""
+        start = time.monotonic()
+        proc, kind = self._start(command, cmd, stdin_input)
+        finished = self._kill_on_cancel(proc, cancel)
+        # Reading lines blocks, so the timeout is a watchdog that kills the process
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            self._kill(proc)
+
+        watchdog = threading.Timer(timeout, expire) if timeout else None
+        stderr_chunks: List[str] = []
+        stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+        stderr_thread.start()
+        lines = []
+        try:
+            if watchdog:
+                watchdog.start()
+            if stdin_input is not None:
+                proc.stdin.write(stdin_input)
+                proc.stdin.close()
+            for line in proc.stdout:
+                lines.append(line)
+                on_line(line)
+            proc.wait()
+        except BaseException:
+            self._kill(proc)
+            raise
+        finally:
+            finished.set()
+            if watchdog:
+                watchdog.cancel()
+        stderr_thread.join(timeout=5)
+        stdout = "".join(lines)
+        if cancel is not None and cancel.is_set():
+            raise concurrent.futures.CancelledError()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, output=stdout)
+        self.latency.record(f"{command}:{kind}", time.monotonic() - start)
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr="".join(stderr_chunks))
+        return stdout
+
+    def run_ollama(self, model: str, prompt: str, timeout: Optional[float] = None, output_format="json") -> str:
+        """Generate via the local Ollama server. The model stays loaded for OLLAMA_KEEP_ALIVE.
+
+        output_format is "json" or a JSON schema the output must follow.
+        """
+        host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        if not host.startswith("http"):
+            host = f"http://{host}"
+        body = json.dumps({"model": model, "prompt": prompt, "format": output_format, "stream": False,
+                           "keep_alive": OLLAMA_KEEP_ALIVE}).encode("utf-8")
+        request = urllib.request.Request(f"{host}/api/generate", data=body,
+                                         headers={"Content-Type": "application/json"})
+        start = time.monotonic()
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = json.loads(response.read().decode("utf-8"))
+        self.latency.record("ollama:warm", time.monotonic() - start)
+        return data.get("response", "")
+
+    def _kill(self, proc: subprocess.Popen):
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def close(self):
+        """Kill all idle spares."""
+        atexit.unregister(self.close)  # Drop the reference so a closed pool can be garbage collected
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, {}
+        for procs in idle.values():
+            for proc, _ in procs:
+                self._kill(proc)
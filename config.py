@@ -3,10 +3,88 @@
 # TTS Config
 TTS_ENABLED = True   # Set to False to disable text-to-speech
 TTS_RATE = "+30%"    # Speech speed: "+30%" = 30% faster, "-10%" = 10% slower
+TTS_MAX_CONCURRENT = 3  # Utterances synthesized at once on the TTS loop (upcoming lines queue behind)
+TTS_CACHE_DIR = None    # Synthesized clips cache (see tts_cache.py); None = <tempdir>/mafia_tts_cache
+TTS_CACHE_MAX_MB = 200  # Least recently used clips are deleted past this size
+AUDIO_BACKEND = "auto"  # Player: "auto", "afplay", "ffplay", "mpg123", "paplay" or "none" (see audio_backends.py)
 AUTO_CONTINUE = True # Set to True to run without user intervention
 MEMORY_ENABLED = True # Set to True to enable distinct memories per player from previous games
 REVEAL_ROLE_ON_DEATH = False # Set to False to hide role when player dies
 
+# Mock provider (provider: "mock") - deterministic local stand-in for load testing, no network
+MOCK_SEED = None             # None = derive from random.seed() so tournament seeds reproduce games
+MOCK_LATENCY = (0.0, 0.0)    # Simulated (min, max) seconds per call
+MOCK_FAILURE_RATE = 0.0      # Fraction of calls that raise a transport error
+MOCK_MALFORMED_RATE = 0.0    # Fraction of responses with repairable broken JSON
+
+# Warm CLI pool - spare CLI processes are pre-spawned and wait on stdin for the next prompt
+CLI_WARM_COMMANDS = ["claude", "codex", "gemini", "qwen"]  # CLIs that read the prompt from stdin
+CLI_WARM_SPARES = 1          # Idle spares kept per command line (0 = always cold-spawn)
+CLI_WARM_MAX_IDLE = 600      # Seconds before an idle spare is discarded
+OLLAMA_KEEP_ALIVE = "30m"    # Ollama runs over its HTTP API and keeps the model loaded this long
+
+# Streamed responses - Day speech audio starts synthesizing as soon as the "speech" field has streamed in
+STREAM_SPEECH = True         # Also switches the claude CLI to --output-format stream-json
+
+# API HTTP connection pooling (clients are created once and reused across turns)
+HTTP_MAX_CONNECTIONS = 32    # Pooled keep-alive connections per provider
+HTTP_KEEPALIVE_EXPIRY = 120  # Seconds an idle connection is kept open
+
+# Retries for a failed turn (see retry_policy.py)
+RETRY_POLICY = {
+    "max_attempts": 4,             # Attempts for transport / rate-limit / CLI failures
+    "max_parse_retries": 2,        # Extra immediate attempts when the reply is unparseable JSON
+    "base_delay": 1.0,             # Backoff base (seconds), doubled per attempt with full jitter
+    "rate_limit_base_delay": 5.0,  # Backoff base for 429s; Retry-After wins when it is longer
+    "max_delay": 60.0,             # Cap on any single wait
+}
+
+# Concurrency / rate limits per provider (see rate_limiter.py), shared by all calls in the process.
+# max_concurrency = calls in flight, rpm = requests per minute (token bucket), None = unlimited.
+# Keys are a provider or "provider/model"; roster entries can also set "max_concurrency" / "rpm".
+PROVIDER_LIMITS = {
+    "default":    {"max_concurrency": 4},
+    "openai":     {"max_concurrency": 6},
+    "anthropic":  {"max_concurrency": 6},
+    "google":     {"max_concurrency": 6},
+    "qwen":       {"max_concurrency": 4},
+    "xai":        {"max_concurrency": 8},
+    "groq":       {"max_concurrency": 4, "rpm": 30},
+    "openrouter": {"max_concurrency": 4, "rpm": 20},  # :free models are capped at ~20 req/min
+    "ollama":     {"max_concurrency": 8},  # Local server, no quota
+    "mock":       {},                      # Unlimited
+}
+
+# Per-turn deadline and hedged requests - bounds how long one slow model can stall a phase
+TURN_DEADLINE = 180          # Seconds a turn may take (retries included); None = wait forever
+TURN_FALLBACK = {"strategy": "", "speech": "I'll pass for now.", "vote": None}  # Used on a missed deadline; None = raise
+HEDGE_PERCENTILE = 90        # Send a second request once a turn is slower than this percentile; None = never hedge
+HEDGE_MIN_SAMPLES = 5        # Completed turns of a model needed before it is hedged
+HEDGE_MIN_DELAY = 15         # Never hedge earlier than this (seconds)
+
+# Prompt context budget (see context_manager.py). When system + turn prompt would exceed this many
+# estimated tokens, the oldest phases of the game log are condensed to an extractive summary, then dropped.
+# Keys are a provider or "provider/model"; roster entries can set "context_budget". None = never condense.
+CONTEXT_BUDGETS = {
+    "default":    32000,
+    "openrouter": 8000,       # :free models often have small context windows
+    "groq":       6000,
+    "ollama":     8000,
+}
+CHARS_PER_TOKEN = {"default": 4.0, "anthropic": 3.5, "qwen": 3.5}  # Token estimate per provider
+CONTEXT_KEEP_RECENT_PHASES = 3  # Latest phases (e.g. Night, LastWords, Day) always kept verbatim
+CONTEXT_SUMMARY_CHARS = 120     # Max length of a condensed speech
+
+# Game stats database (SQLite, see stats_store.py). An old game_stats.json next to it is imported once, on first use.
+STATS_DB_PATH = "game_stats.db"
+ELO_START = 1500             # Rating of a player's first game
+ELO_K = 24                   # Elo step size per game (team Elo: Mafia vs Town mean ratings, zero-sum)
+ELO_ROLE_PRIOR = 10          # Pseudo-games at a 50% Mafia win rate when estimating the Mafia role advantage
+
+# Game event log (games/game_<ts>.jsonl, see event_log.py)
+EVENT_LOG_FLUSH_INTERVAL = 0.2  # Seconds of events batched into one write
+EVENT_LOG_FSYNC_INTERVAL = 5.0  # Seconds between fsyncs (always fsynced on close)
+
 # Narrator voice for system announcements
 NARRATOR_VOICE = "en-US-AriaNeural"
 
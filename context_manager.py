@@ -0,0 +1,194 @@
+# context_manager.py - Token-budgeted game log rendering for turn prompts
+
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from config import CONTEXT_BUDGETS, CHARS_PER_TOKEN, CONTEXT_KEEP_RECENT_PHASES, CONTEXT_SUMMARY_CHARS
+from schemas import LogStore
+
+CONDENSED_NOTE = "(Older phases condensed: speeches cut to their first sentence, trial ballots shown as tallies.)\n"
+
+_LEADING_TAGS = re.compile(r"^(?:\[[^\]]*\]\s*)+")    # [Last Words], [Defense], [Suggests killing X] ...
+_TRAILING_VOTE = re.compile(r"\s*(?:\[VOTE: [^\]]*\]|\(Secret Vote\))$")
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(?=\s|$)", re.DOTALL)
+
+
+def chars_per_token(provider: str) -> float:
+    return CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN["default"])
+
+
+def context_budget(provider: str, model: str, override: Optional[int] = None) -> Optional[int]:
+    """Prompt token budget for a model: roster override, then "provider/model", provider and default keys."""
+    if override is not None:
+        return override
+    model_key = f"{provider}/{model}"
+    if model_key in CONTEXT_BUDGETS:
+        return CONTEXT_BUDGETS[model_key]
+    return CONTEXT_BUDGETS.get(provider, CONTEXT_BUDGETS.get("default"))
+
+
+def summarize_line(actor: str, action: str, content: str, max_chars: int = CONTEXT_SUMMARY_CHARS) -> Optional[str]:
+    """Condensed content of one log line, or None to leave it out of the summary.
+
+    System lines (deaths, tallies, nominations) are short facts and kept as they are.
+    Trial ballots are dropped because the VoteSummary lines that follow carry them.
+    Speech keeps its tags and vote marker and is cut to its first sentence.
+    """
+    if actor == "System":
+        return content
+    if action == "vote":
+        return None
+    tags = _LEADING_TAGS.match(content)
+    prefix = tags.group(0) if tags else ""
+    vote = _TRAILING_VOTE.search(content)
+    suffix = vote.group(0) if vote else ""
+    body = content[len(prefix):len(content) - len(suffix)].strip()
+
+    sentence = _FIRST_SENTENCE.match(body)
+    short = sentence.group(1) if sentence else body
+    if len(short) > max_chars:
+        short = short[:max_chars].rsplit(" ", 1)[0] + "..."
+    elif len(short) < len(body):
+        short += " ..."
+    return f"{prefix}{short}{suffix}"
+
+
+class _Phase:
+    """A run of log entries with the same (turn, phase). Closed once a later phase starts."""
+    __slots__ = ("key", "start", "end", "text", "summary")
+
+    def __init__(self, key, start: int):
+        self.key = key
+        self.start = start
+        self.end = start
+        self.text = ""
+        self.summary: Optional[str] = None
+
+
+class _StreamIndex:
+    """Phase boundaries and rendered text of one LogStore, extended as entries are appended."""
+
+    def __init__(self):
+        self.count = 0
+        self.phases: List[_Phase] = []
+
+    def update(self, logs: LogStore):
+        if len(logs) < self.count:
+            self.__init__()
+        for turn, phase, actor, action, content in logs.rows(self.count):
+            if not self.phases or self.phases[-1].key != (turn, phase):
+                self.phases.append(_Phase((turn, phase), self.count))
+            current = self.phases[-1]
+            current.text += f"[{phase}] {actor}: {content}\n"
+            self.count += 1
+            current.end = self.count
+
+    def size(self) -> int:
+        return sum(len(p.text) for p in self.phases)
+
+
+class ContextManager:
+    """Fits a player's visible game logs into their model's prompt budget.
+
+    One instance per game, shared by all players. Logs are indexed by phase; when a
+    prompt would go over budget the oldest phases are replaced by an extractive summary
+    (then dropped), while the most recent CONTEXT_KEEP_RECENT_PHASES stay verbatim.
+    Each phase is summarized once and reused by every player reading that log, so all
+    players with the same visibility (public, Mafia, Cop) see the same condensed history.
+    """
+
+    def __init__(self, keep_recent: int = CONTEXT_KEEP_RECENT_PHASES):
+        self.keep_recent = max(1, keep_recent)
+        self._streams: Dict[int, _StreamIndex] = {}
+        self._lock = threading.Lock()
+        # provider -> prompts, estimated tokens, prompts that needed condensing
+        self._usage = defaultdict(lambda: {"prompts": 0, "tokens": 0, "condensed": 0})
+
+    def _index(self, logs: LogStore) -> _StreamIndex:
+        index = self._streams.get(logs.uid)
+        if index is None:
+            index = self._streams[logs.uid] = _StreamIndex()
+        index.update(logs)
+        return index
+
+    def _summary(self, logs: LogStore, phase: _Phase) -> str:
+        if phase.summary is None:
+            lines = []
+            for _, phase_name, actor, action, content in logs.rows(phase.start, phase.end):
+                short = summarize_line(actor, action, content)
+                if short is not None:
+                    lines.append(f"[{phase_name}] {actor}: {short}\n")
+            phase.summary = "".join(lines)
+        return phase.summary
+
+    def _fit_stream(self, logs: LogStore, index: _StreamIndex, budget_chars: int) -> str:
+        phases = index.phases
+        parts = [p.text for p in phases]
+        size = sum(len(part) for part in parts)
+        older = max(0, len(phases) - self.keep_recent)
+
+        condensed = 0
+        while size > budget_chars and condensed < older:
+            parts[condensed] = self._summary(logs, phases[condensed])
+            size += len(parts[condensed]) - len(phases[condensed].text)
+            condensed += 1
+
+        dropped = 0
+        while size > budget_chars and dropped < older:
+            size -= len(parts[dropped])
+            dropped += 1
+
+        header = CONDENSED_NOTE if condensed > dropped else ""
+        if dropped:
+            header += f"({dropped} earlier phase{'s' if dropped > 1 else ''} omitted.)\n"
+        return header + "".join(parts[dropped:])
+
+    def fit(self, streams: Dict[str, LogStore], budget_chars: Optional[int]) -> Dict[str, Optional[str]]:
+        """Rendered text per stream within budget_chars in total.
+
+        None for a stream means it fits verbatim (the caller renders it as usual).
+        Secret logs are fitted first, each to at most a quarter of the budget; the
+        public log gets what is left.
+        """
+        result: Dict[str, Optional[str]] = {name: None for name in streams}
+        if budget_chars is None:
+            return result
+        with self._lock:
+            indexes = {name: self._index(logs) for name, logs in streams.items()}
+            sizes = {name: index.size() for name, index in indexes.items()}
+            if sum(sizes.values()) <= budget_chars:
+                return result
+
+            remaining = budget_chars
+            for name in sorted(streams, key=lambda n: n == "public"):
+                share = remaining if name == "public" else budget_chars // 4
+                if sizes[name] > share:
+                    result[name] = self._fit_stream(streams[name], indexes[name], max(0, share))
+                    remaining -= len(result[name])
+                else:
+                    remaining -= sizes[name]
+        return result
+
+    def current_phase(self, logs: LogStore) -> str:
+        """Rendered text of the latest phase of a log (always kept verbatim)."""
+        with self._lock:
+            index = self._index(logs)
+            return index.phases[-1].text if index.phases else ""
+
+    def record(self, provider: str, prompt_chars: int, condensed: bool):
+        with self._lock:
+            usage = self._usage[provider]
+            usage["prompts"] += 1
+            usage["tokens"] += int(prompt_chars / chars_per_token(provider))
+            usage["condensed"] += int(condensed)
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            usage = {k: dict(v) for k, v in self._usage.items()}
+        return [
+            f"{provider:<28} prompts={u['prompts']:<4} ~tokens={u['tokens']:<8} "
+            f"avg={u['tokens'] // max(1, u['prompts']):<6} condensed={u['condensed']}"
+            for provider, u in sorted(usage.items())
+        ]
@@ -4,62 +4,92 @@ import os
 import re
 import shutil
 import time
+import threading
 import concurrent.futures
+import contextlib
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 from models import Player, HumanPlayer
 from api_clients import UnifiedLLMClient
+from event_log import EventLog
+from context_manager import ContextManager
+from stats_store import append_game_records
 from schemas import GameState, LogEntry, TurnOutput
 from config import (
     TTS_ENABLED, AUTO_CONTINUE, MEMORY_ENABLED, REVEAL_ROLE_ON_DEATH,
-    NARRATOR_VOICE, ROLE_EMOJIS, PHASE_EMOJIS, ROSTER_CONFIG
+    NARRATOR_VOICE, ROLE_EMOJIS, PHASE_EMOJIS, ROSTER_CONFIG, STATS_DB_PATH, STREAM_SPEECH
 )
 from tts_engine import TTSEngine
 from input_listener import InputListener
 
 
+def _delete_prepared_audio(future: concurrent.futures.Future):
+    path = future.result()
+    if path and os.path.exists(path):
+        os.unlink(path)
+
+
 class GameEngine:
-    def __init__(self, tts_enabled: bool = TTS_ENABLED):
+    def __init__(self, tts_enabled: bool = TTS_ENABLED, headless: bool = False, work_dir: str = ".",
+                 stats_path: Optional[str] = STATS_DB_PATH, memory_enabled: bool = MEMORY_ENABLED,
+                 roster: Optional[List[dict]] = None):
+        # Headless mode: no TTS, no terminal, no pauses (batch runs, cron, containers)
+        self.headless = headless
+        if headless:
+            tts_enabled = False
+
+        # All game directories live under work_dir so parallel games stay isolated
+        self.work_dir = work_dir
+        self.logs_dir = os.path.join(work_dir, "logs")
+        self.games_dir = os.path.join(work_dir, "games")
+        self.memories_dir = os.path.join(work_dir, "memories")
+        self.stats_path = stats_path  # None = keep record in memory only (see self.game_record)
+        self.memory_enabled = memory_enabled
+        self.game_record: Optional[dict] = None
+        self.turn_log: List[dict] = []  # Every player action in order, stored with the game record
+        self.roster = roster if roster is not None else ROSTER_CONFIG
+
         # Clean Logs - User requested logs/ be wiped on new game
-        if os.path.exists("logs"):
-            shutil.rmtree("logs")
-        os.makedirs("logs", exist_ok=True)
+        if os.path.exists(self.logs_dir):
+            shutil.rmtree(self.logs_dir)
+        os.makedirs(self.logs_dir, exist_ok=True)
 
         # Create persistent games directory
-        os.makedirs("games", exist_ok=True)
+        os.makedirs(self.games_dir, exist_ok=True)
         # Create memories directory
-        os.makedirs("memories", exist_ok=True)
+        os.makedirs(self.memories_dir, exist_ok=True)
 
-        # Initialize Game Log as a flat file in games/
+        # Game event log: one JSONL file in games/ (transcript lines, log entries, LLM calls),
+        # written by a background thread. Render with: python event_log.py games/game_<ts>.jsonl
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        self.game_log_path = os.path.join("games", f"game_{timestamp}.txt")
+        self.game_log_path = os.path.join(self.games_dir, f"game_{timestamp}.jsonl")
+        self.events = EventLog(self.game_log_path)
+        self.events.emit("game_start", title=f"=== MAFIA GAME LOG ({timestamp}) ===")
 
-        with open(self.game_log_path, "w", encoding='utf-8') as f:
-            f.write(f"=== MAFIA GAME LOG ({timestamp}) ===\n")
-
-        # Restore individual player logs in logs/ dir
-        self.client = UnifiedLLMClient(debug=True, log_dir="logs")
+        self.client = UnifiedLLMClient(debug=True, log_dir=self.logs_dir, events=self.events)
+        self.client.governor.configure_roster(self.roster)
+        self.context = ContextManager()  # Shared by all players: one condensed summary per phase and log
         self.state = GameState(reveal_role_on_death=REVEAL_ROLE_ON_DEATH)
         self.players: List[Player] = []
         self.active_players: Dict[str, Player] = {}  # Name -> Player obj
 
         # Initialize TTS
         self.tts = TTSEngine(enabled=tts_enabled)
+        # Day speech audio started from the streamed "speech" field, before the full turn is parsed
+        self._early_audio: Dict[str, Tuple[str, concurrent.futures.Future]] = {}  # Player -> (speech, audio future)
+        self._early_audio_lock = threading.Lock()  # Written from the turn worker threads
 
         # Human player mode tracking
         self.human_mode = False
         self.human_player: Optional[Player] = None
         self.human_role: Optional[str] = None
         self.listener: Optional[InputListener] = None  # Set in run()
+        self.winner: Optional[str] = None  # Set when the game ends
 
     def _log_to_file(self, text: str):
         """Write to game log file only"""
-        try:
-            with open(self.game_log_path, "a", encoding='utf-8') as f:
-                f.write(str(text) + "\n")
-        except:
-            pass
+        self.events.emit("line", text=str(text))
 
     def _print_console(self, text: str):
         """Print to console only"""
@@ -78,6 +108,7 @@ class GameEngine:
 
     def _announce(self, text: str, background: bool = False):
         """Speak system announcement with narrator voice"""
+        self.events.emit("announce", text=text)
         self.tts.speak(text, voice=NARRATOR_VOICE, background=background)
 
     def log(self, phase: str, actor: str, action: str, content: str, is_secret: bool = False, vote_target: str = None, target_log: str = None):
@@ -175,18 +206,33 @@ class GameEngine:
                 elif effective_target == "Cop" and self.human_role == "Cop":
                     is_spoiler = False
 
+            self._emit_entry(entry, effective_target.lower())
             display_content = content.replace("[Nominated", "[👉 Nominated").replace("[Suggests killing", "[🔪 Suggests killing").replace("[Defense]", "[🛡️ Defense]").replace("votes guilty", "👎 votes guilty").replace("votes innocent", "👍 votes innocent").replace("abstains", "⏸️ abstains")
             self._print(f"\n{display_icon}{actor_display} {vote_str} {display_content}", spoiler=is_spoiler)
         else:
             self.state.public_logs.append(entry)
+            self._emit_entry(entry, "public")
             display_content = content.replace("[Nominated", "[👉 Nominated").replace("[Suggests killing", "[🔪 Suggests killing").replace("[Defense]", "[🛡️ Defense]").replace("votes guilty", "👎 votes guilty").replace("votes innocent", "👍 votes innocent").replace("abstains", "⏸️ abstains")
             self._print(f"\n{display_icon}{actor_display}{vote_str} {display_content}")
 
+    def _append_entry(self, log: str, phase: str, action: str, content: str):
+        """Silently add a System entry to the public/cop/mafia log (no print, no TTS), keeping the event log complete."""
+        entry = LogEntry(turn=self.state.turn, phase=phase, actor="System", action=action, content=content)
+        getattr(self.state, f"{log}_logs").append(entry)
+        self._emit_entry(entry, log)
+
+    def _emit_entry(self, entry: LogEntry, log: str):
+        if entry.actor in self.active_players:
+            self.turn_log.append({"turn": entry.turn, "phase": entry.phase, "player": entry.actor,
+                                  "action": entry.action, "content": entry.content, "log": log})
+        self.events.emit("entry", log=log, turn=entry.turn, phase=entry.phase, actor=entry.actor,
+                         action=entry.action, content=entry.content)
+
     def setup_game(self):
         self._print("Initializing Game...")
 
         # 1. Filter active players and randomize order
-        roster = [p for p in ROSTER_CONFIG if p.get("active", True)]
+        roster = [p for p in self.roster if p.get("active", True)]
         random.shuffle(roster)
 
         player_count = len(roster)
@@ -241,6 +287,8 @@ class GameEngine:
 
             # Check if this is a human player
             if config.get("provider") == "human":
+                if self.headless:
+                    raise ValueError(f"Headless mode cannot seat human player {config['name']}")
                 p = HumanPlayer(
                     name=config["name"],
                     role=role,
@@ -259,14 +307,19 @@ class GameEngine:
                     client=self.client,
                     player_index=i+1,
                     use_cli=config.get("use_cli", True),
-                    memory_enabled=MEMORY_ENABLED
+                    memory_enabled=self.memory_enabled,
+                    memory_dir=self.memories_dir,
+                    context=self.context,
+                    context_budget_tokens=config.get("context_budget")
                 )
             self.players.append(p)
             self.state.players.append(p.state)
             self.active_players[p.state.name] = p
 
-            # Register TTS voice for player
-            self.tts.register_player(config["name"], config.get("voice", "en-US-AriaNeural"))
+            # Register TTS voice for player (also logged, so replays can be rendered with the same voices)
+            voice = config.get("voice", "en-US-AriaNeural")
+            self.tts.register_player(config["name"], voice)
+            self.events.emit("player", name=config["name"], voice=voice, role=role)
 
             if role == "Mafia":
                 mafia_names.append(p.state.name)
@@ -310,12 +363,16 @@ class GameEngine:
 
     def _wait_for_speech_with_pause(self, listener):
         """Wait for TTS to finish while checking for SPACE to pause"""
+        if self.headless:
+            return
         while self.tts._current_thread and self.tts._current_thread.is_alive():
             if listener and listener.check_for_space():
                 self._pause_game(listener)
             time.sleep(0.1)
 
     def _wait_for_next(self, listener=None):
+        if self.headless:
+            return
         if AUTO_CONTINUE:
             # Poll for SPACE key during sleep
             steps = 20  # 2 seconds / 0.1s
@@ -367,25 +424,62 @@ class GameEngine:
                 self.listener.resume_cbreak()
         return output
 
-    def _start_background_turn(self, player: Player) -> Tuple[Optional[concurrent.futures.Future], Optional[concurrent.futures.ThreadPoolExecutor]]:
-        """Start a player's turn in background thread. Returns (future, executor)."""
+    def _start_background_turn(self, player: Player, stream_speech: bool = False) -> Tuple[Optional[concurrent.futures.Future], Optional[concurrent.futures.ThreadPoolExecutor]]:
+        """Start a player's turn in background thread. Returns (future, executor).
+
+        stream_speech=True starts the speech audio as soon as the model has streamed its speech
+        (see _take_early_audio), overlapping synthesis with the rest of the response.
+        """
         if not player:
             return None, None
         # Don't background human players - they need interactive input
         if isinstance(player, HumanPlayer):
             return None, None
+        on_speech = self._early_speech_handler(player) if stream_speech and STREAM_SPEECH and self.tts.enabled else None
         executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        future = executor.submit(player.take_turn, self.state, self.state.turn)
+        future = executor.submit(player.take_turn, self.state, self.state.turn, on_speech)
         return future, executor
 
+    def _early_speech_handler(self, player: Player):
+        name = player.state.name
+        self._discard_early_audio(name)
+
+        def on_speech(speech: str):
+            if speech.strip():
+                # A retry or hedged request may stream a different speech; the latest one wins
+                audio = self.tts.submit_speech(speech, name, announce_name=True)
+                with self._early_audio_lock:
+                    early = self._early_audio.get(name)
+                    self._early_audio[name] = (speech, audio)
+                if early:
+                    early[1].add_done_callback(_delete_prepared_audio)
+        return on_speech
+
+    def _discard_early_audio(self, name: str):
+        with self._early_audio_lock:
+            early = self._early_audio.pop(name, None)
+        if early:
+            early[1].add_done_callback(_delete_prepared_audio)
+
+    def _take_early_audio(self, player: Player, speech: str) -> Optional[concurrent.futures.Future]:
+        """Audio started from the streamed speech, if it matches the final turn's speech."""
+        with self._early_audio_lock:
+            early = self._early_audio.pop(player.state.name, None)
+        if not early or early[0] != speech:
+            if early:
+                early[1].add_done_callback(_delete_prepared_audio)
+            return None
+        return early[1]
+
     def _get_background_result(self, future: Optional[concurrent.futures.Future], executor: Optional[concurrent.futures.ThreadPoolExecutor]) -> Optional[TurnOutput]:
         """Get result from background turn and cleanup executor."""
         if not future:
             return None
-        result = future.result()
-        if executor:
-            executor.shutdown()
-        return result
+        try:
+            return future.result()
+        finally:
+            if executor:
+                executor.shutdown()
 
     def _check_game_ends_after_death(self, victim_name: str) -> bool:
         """Check if game would end after this player's death."""
@@ -395,13 +489,13 @@ class GameEngine:
         return (future_mafia == 0) or (future_mafia >= future_town)
 
     def _collect_votes_concurrently(self, voters: List[Player], all_votes: dict, listener, nominees: List[str]):
-        """Collect votes from all voters in up to 4 concurrent processes"""
+        """Collect votes from all voters concurrently (the client's governor caps calls per provider)"""
 
-        def collect_voter_vote(voter: Player):
+        async def collect_voter_vote(voter: Player):
             """Collect one voter's single vote for a nominee (MANDATORY)"""
             try:
                 # Set phase to Trial for voting context (they're voting on nominees)
-                output = voter.take_turn(self.state, self.state.turn)
+                output = await voter.atake_turn(self.state, self.state.turn)
 
                 if output.strategy:
                     prefix = self._get_strategy_prefix(voter)
@@ -455,29 +549,16 @@ class GameEngine:
             all_votes[voter_name] = vote
             self.log("Trial", voter_name, "vote", f"votes for {vote}")
 
-        # Use ThreadPoolExecutor with max 4 workers for concurrent AI voting
-        if ai_voters:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                futures = [executor.submit(collect_voter_vote, voter) for voter in ai_voters]
-
-                for future in concurrent.futures.as_completed(futures):
-                    voter_name, vote = future.result()
-                    all_votes[voter_name] = vote
-                    self.log("Trial", voter_name, "vote", f"votes for {vote}")
+        # All AI votes in flight at once on the client's event loop, each logged as it arrives;
+        # provider rate/concurrency limits are enforced in the client
+        for voter_name, vote in self.client.run_async_as_completed(collect_voter_vote(v) for v in ai_voters):
+            all_votes[voter_name] = vote
+            self.log("Trial", voter_name, "vote", f"votes for {vote}")
 
     def _save_game_stats(self, winner: str):
-        """Save game stats to game_stats.json"""
-        stats_path = "game_stats.json"
-
-        # Load existing stats or create new
-        if os.path.exists(stats_path):
-            with open(stats_path, "r", encoding="utf-8") as f:
-                stats = json.load(f)
-        else:
-            stats = {"games": []}
-
+        """Save game stats to the SQLite stats store"""
         # Build game record
-        game_id = os.path.basename(self.game_log_path).replace("game_", "").replace(".txt", "")
+        game_id = os.path.basename(self.game_log_path).replace("game_", "").replace(".jsonl", "")
         mafia_names = [p.state.name for p in self.players if p.state.role == "Mafia"]
 
         game_record = {
@@ -494,15 +575,18 @@ class GameEngine:
                     "model": p.state.model_name
                 }
                 for p in self.players
-            ]
+            ],
+            "turn_log": self.turn_log
         }
 
-        stats["games"].append(game_record)
+        self.game_record = game_record
+        self.events.emit("game_end", winner=winner, turns=self.state.turn, mafia=mafia_names)
+        if not self.stats_path:
+            return
 
-        with open(stats_path, "w", encoding="utf-8") as f:
-            json.dump(stats, f, indent=2)
+        append_game_records(self.stats_path, [game_record])
 
-        self._print(f"[Stats] Game saved to {stats_path}")
+        self._print(f"[Stats] Game saved to {self.stats_path}")
 
     def check_game_over(self) -> bool:
         mafia_count = sum(1 for p in self._get_living_players() if p.state.role == "Mafia")
@@ -511,21 +595,43 @@ class GameEngine:
         if mafia_count == 0:
             self._print("\n🎉 TOWN WINS! All Mafia eliminated. 🎉")
             self._announce("Town wins! All Mafia have been eliminated")
+            self.winner = "Town"
             self._save_game_stats("Town")
             self._run_reflection("Town")
             return True
         if mafia_count >= town_count:
             self._print("\n💀 MAFIA WINS! They have parity with Town. 💀")
             self._announce("Mafia wins!")
+            self.winner = "Mafia"
             self._save_game_stats("Mafia")
             self._run_reflection("Mafia")
             return True
         return False
 
-    def run(self):
-        with InputListener() as listener:
+    def run_headless(self) -> Optional[str]:
+        """Run a full game with no TTY, TTS or pauses. Returns the winner."""
+        self.headless = True
+        self.tts.enabled = False
+        return self.run()
+
+    def run(self) -> Optional[str]:
+        """Play the game to the end and return the winner. TTS, clients and the event log are closed even on errors."""
+        try:
+            self._play()
+            self._print_latency_report()
+        finally:
+            self.tts.close()
+            self.client.close()
+            self.events.close()
+        return self.winner
+
+    def _play(self):
+        # Headless runs never touch stdin (no termios under cron/containers)
+        listener_ctx = contextlib.nullcontext() if self.headless else InputListener()
+        with listener_ctx as listener:
             self.listener = listener  # Store for human input handling
             self.setup_game()
+            self._prewarm_clients()
     
             while True:
                 # Wait for any remaining TTS before checking win
@@ -556,10 +662,12 @@ class GameEngine:
                 phase_flow = " -> Night" if self.state.turn == 1 else " -> Trial -> Night"
                 self.log("Day", "System", "Info", f"Speaking order: {', '.join(p.state.name for p in ordered_living)}{phase_flow}")
 
-                # Start first speaker's turn in background while announcement plays
-                first_speaker_future, executor = self._start_background_turn(
-                    ordered_living[0] if ordered_living else None
-                )
+                # Pipelined speaking: each speaker's turn is generated in the background, started as soon
+                # as the previous speaker's output is in the logs (the first one while the announcement plays).
+                # Nothing changes the state between that point and the speaker's turn, so every speaker
+                # sees exactly what the sequential loop would show them.
+                next_speaker = ordered_living[0] if ordered_living else None
+                next_future, next_executor = self._start_background_turn(next_speaker, stream_speech=True)
 
                 for i, player in enumerate(ordered_living):
                     # Double-check aliveness just in case state drifted
@@ -568,11 +676,11 @@ class GameEngine:
                         continue
 
                     try:
-                        # Use pre-generated output for first speaker if available
-                        if i == 0 and first_speaker_future:
-                            output = self._get_background_result(first_speaker_future, executor)
+                        # Use pre-generated output if this speaker's turn was started in the background
+                        if next_future and next_speaker is player:
+                            output = self._get_background_result(next_future, next_executor)
                         else:
-                            # Generate while previous TTS might still be playing
+                            # Human players (and anyone not pre-started) take their turn now
                             output = self._take_player_turn(player)
     
                         # Prepare TTS immediately (before waiting for previous to finish)
@@ -585,9 +693,14 @@ class GameEngine:
                         
                         tts_text = f"{speech} {spoken_action}".strip() if speech else spoken_action
                         audio_path = None
-                        if tts_text:
-                            # This blocks MAIN thread but runs while PREV TTS thread is playing
-                            audio_path = self.tts.prepare_speech(tts_text, player.state.name, announce_name=True)
+                        early_audio = self._take_early_audio(player, speech) if speech else None
+                        if early_audio:
+                            # Speech audio was started while the turn streamed; only the nomination is left
+                            audio_path = self.tts.concat_audio([early_audio, self.tts.submit_speech(
+                                spoken_action, player.state.name)]) if spoken_action else early_audio
+                        elif tts_text:
+                            # Synthesized on the TTS loop while PREV TTS thread is playing
+                            audio_path = self.tts.submit_speech(tts_text, player.state.name, announce_name=True)
 
                         # Wait for previous TTS before displaying new output
                         self._wait_for_speech_with_pause(listener)
@@ -605,8 +718,12 @@ class GameEngine:
     
                     except Exception as e:
                         self.log("Day", player.state.name, "error", f"Failed to speak: {e}")
-    
-                    # User can press Enter while TTS plays to trigger next generation
+
+                    # This speaker is logged - start the next one generating while TTS plays
+                    next_speaker = next((p for p in ordered_living[i + 1:] if p.state.is_alive), None)
+                    next_future, next_executor = self._start_background_turn(next_speaker, stream_speech=True)
+
+                    # User can press Enter while TTS plays to move on to the next speaker
                     self._wait_for_next(listener)
     
                 # 2. Trial Round
@@ -675,7 +792,7 @@ class GameEngine:
                             speech = output.speech or ""
                             audio_path = None
                             if speech:
-                                audio_path = self.tts.prepare_speech(speech, accused_name, announce_name=True)
+                                audio_path = self.tts.submit_speech(speech, accused_name, announce_name=True)
 
                             # Wait for previous TTS while current is being prepared
                             self._wait_for_speech_with_pause(listener)
@@ -754,10 +871,7 @@ class GameEngine:
                                     trial_role_emoji = self._get_role_emoji(trial_victim.state.role)
 
                                     # Add death to public logs so victim sees it (role reveal logged later)
-                                    self.state.public_logs.append(LogEntry(
-                                        turn=self.state.turn, phase="Trial", actor="System",
-                                        action="Death", content=f"{first_target} was voted out"
-                                    ))
+                                    self._append_entry("public", "Trial", "Death", f"{first_target} was voted out")
 
                                     # Start last words in background
                                     trial_last_words_future, trial_lw_executor = self._start_background_turn(trial_victim)
@@ -807,7 +921,7 @@ class GameEngine:
                                 speech = output.speech or ""
                                 audio_path = None
                                 if speech:
-                                    audio_path = self.tts.prepare_speech(speech, kill_target, announce_name=True)
+                                    audio_path = self.tts.submit_speech(speech, kill_target, announce_name=True)
 
                                 if not isinstance(trial_victim, HumanPlayer):
                                     self._announce(f"{kill_target}, last words.")
@@ -840,7 +954,7 @@ class GameEngine:
                                     speech = output.speech or ""
                                     audio_path = None
                                     if speech:
-                                        audio_path = self.tts.prepare_speech(speech, kill_target, announce_name=True)
+                                        audio_path = self.tts.submit_speech(speech, kill_target, announce_name=True)
 
                                     self._wait_for_speech_with_pause(listener)
 
@@ -926,7 +1040,7 @@ class GameEngine:
                             audio_path = None
                             should_play_tts = not self.human_mode or self.human_role == "Mafia"
                             if tts_text and should_play_tts:
-                                 audio_path = self.tts.prepare_speech(tts_text, m_player.state.name, announce_name=True)
+                                 audio_path = self.tts.submit_speech(tts_text, m_player.state.name, announce_name=True)
 
                             # Wait for previous TTS before displaying
                             self._wait_for_speech_with_pause(listener)
@@ -1005,7 +1119,7 @@ class GameEngine:
                             audio_path = None
                             should_play_tts = not self.human_mode or self.human_role == "Cop"
                             if tts_text and should_play_tts:
-                                audio_path = self.tts.prepare_speech(tts_text, cop.state.name, announce_name=True)
+                                audio_path = self.tts.submit_speech(tts_text, cop.state.name, announce_name=True)
 
                             self._wait_for_speech_with_pause(listener)
 
@@ -1034,21 +1148,10 @@ class GameEngine:
                                     self._print(f"\n🔍 {cop.state.name} checks {target_name}... Result: {result}", spoiler=is_spoiler)
 
                                     # Log to Cop's secret log
-                                    self.state.cop_logs.append(LogEntry(
-                                        turn=self.state.turn,
-                                        phase=f"Night {self.state.turn}",
-                                        actor="System",
-                                        action="Info",
-                                        content=investigation_msg
-                                    ))
+                                    self._append_entry("cop", f"Night {self.state.turn}", "Info", investigation_msg)
                                 else:
-                                        self.state.cop_logs.append(LogEntry(
-                                        turn=self.state.turn,
-                                        phase=f"Night {self.state.turn}",
-                                        actor="System",
-                                        action="Info",
-                                        content=f"Investigation failed: {target_name} not found."
-                                    ))
+                                    self._append_entry("cop", f"Night {self.state.turn}", "Info",
+                                                       f"Investigation failed: {target_name} not found.")
 
                         except Exception as e:
                             self._print(f"Cop Error: {e}")
@@ -1074,15 +1177,10 @@ class GameEngine:
                             death_role_emoji = self._get_role_emoji(victim.state.role)
 
                             # Add death to public log BEFORE prompt (so victim sees it) - no print yet
-                            self.state.public_logs.append(LogEntry(
-                                turn=self.state.turn, phase="Night", actor="System",
-                                action="Death", content=f"{night_victim} was killed by Mafia"
-                            ))
+                            self._append_entry("public", "Night", "Death", f"{night_victim} was killed by Mafia")
                             if self.state.reveal_role_on_death:
-                                self.state.public_logs.append(LogEntry(
-                                    turn=self.state.turn, phase="Night", actor="System",
-                                    action="RoleReveal", content=f"{death_role_emoji} {night_victim} was a {victim.state.role}"
-                                ))
+                                self._append_entry("public", "Night", "RoleReveal",
+                                                   f"{death_role_emoji} {night_victim} was a {victim.state.role}")
 
                             # Start last words prompt in background (while Cop TTS still playing)
                             # For human players, we can't use background - will handle after TTS
@@ -1106,7 +1204,7 @@ class GameEngine:
                                 night_victim_speech = output.speech or ""
                                 night_victim_strategy = output.strategy
                                 if night_victim_speech:
-                                    night_audio_path = self.tts.prepare_speech(night_victim_speech, night_victim, announce_name=True)
+                                    night_audio_path = self.tts.submit_speech(night_victim_speech, night_victim, announce_name=True)
                             except Exception as e:
                                 self._print(f"Error preparing night last words: {e}")
                         elif isinstance(victim, HumanPlayer):
@@ -1116,7 +1214,7 @@ class GameEngine:
                                 night_victim_speech = output.speech or ""
                                 night_victim_strategy = None  # Human has no strategy
                                 if night_victim_speech:
-                                    night_audio_path = self.tts.prepare_speech(night_victim_speech, night_victim, announce_name=True)
+                                    night_audio_path = self.tts.submit_speech(night_victim_speech, night_victim, announce_name=True)
                             except Exception as e:
                                 self._print(f"Error getting human last words: {e}")
 
@@ -1149,9 +1247,42 @@ class GameEngine:
 
                     self.state.turn += 1
 
+    def _prewarm_clients(self):
+        """Spawn warm CLI workers for every AI player so the first turns skip cold starts."""
+        for p in self.players:
+            if not isinstance(p, HumanPlayer):
+                self.client.prewarm(p.state.provider, p.state.model_name, p.state.use_cli)
+
+    def _print_latency_report(self):
+        lines = self.client.latency_report()
+        if lines:
+            self._print("\n[Latency] LLM call latency (cold = fresh process, warm = pooled)")
+            for line in lines:
+                self._print(f"  {line}")
+        lines = self.client.prompt_cache_report()
+        if lines:
+            self._print("\n[Prompt Cache] Prompt tokens read from provider caches (shared rules + public log prefix)")
+            for line in lines:
+                self._print(f"  {line}")
+        lines = self.tts.cache_report()
+        if lines:
+            self._print("\n[TTS Cache] Synthesized clips served from the disk cache")
+            for line in lines:
+                self._print(f"  {line}")
+        lines = self.client.parse_report()
+        if lines:
+            self._print("\n[Parse] Unparseable responses per model and output mode (each one cost a retry)")
+            for line in lines:
+                self._print(f"  {line}")
+        lines = self.context.report_lines()
+        if lines:
+            self._print("\n[Context] Estimated prompt tokens per provider (condensed = older phases summarized)")
+            for line in lines:
+                self._print(f"  {line}")
+
     def _run_reflection(self, winner: str):
         """Allow all players to reflect and update their memories"""
-        if not MEMORY_ENABLED:
+        if not self.memory_enabled:
             self.log("Reflection", "System", "Skip", "Memory system disabled. Skipping reflection.")
             return
 
@@ -1170,17 +1301,17 @@ class GameEngine:
         # Wait for announcement to finish before starting the reflection loop
         self.tts.wait_for_speech()
 
-        # Parallelize reflection for all players
-        def process_reflection(p):
+        # Reflect concurrently for all players (one coroutine each on the client's event loop)
+        async def process_reflection(p):
             if isinstance(p, HumanPlayer):
                 return p, None # Human doesn't reflect
                 
             try:
-                # 1. Generate Reflection (Blocking)
-                new_memory = p.reflect_on_game(self.state, winner)
+                # 1. Generate Reflection
+                new_memory = await p.areflect_on_game(self.state, winner)
                 
                 # 2. Save to file
-                with open(f"memories/{p.state.name}.txt", "w", encoding='utf-8') as f:
+                with open(os.path.join(self.memories_dir, f"{p.state.name}.txt"), "w", encoding='utf-8') as f:
                     f.write(new_memory)
                 return p, new_memory
             except Exception as e:
@@ -1188,21 +1319,16 @@ class GameEngine:
 
         self._print(f"Starting parallel reflection for {len(self.players)} players...")
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            futures = {executor.submit(process_reflection, p): p for p in self.players}
-            
-            for future in concurrent.futures.as_completed(futures):
-                p, result = future.result()
-                
-                # Skip human
-                if result is None:
-                    continue
+        for p, result in self.client.run_async_as_completed(process_reflection(p) for p in self.players):
+            # Skip human
+            if result is None:
+                continue
 
-                if isinstance(result, Exception):
-                    self._print(f"Error saving memory for {p.state.name}: {result}")
-                else:
-                    self._print(f"\n🧠 {p.state.name} Memory: {result}")
-                    self.log("Reflection", p.state.name, "reflect", result)
+            if isinstance(result, Exception):
+                self._print(f"Error saving memory for {p.state.name}: {result}")
+            else:
+                self._print(f"\n🧠 {p.state.name} Memory: {result}")
+                self.log("Reflection", p.state.name, "reflect", result)
         
         self._print("All memories updated for next game.")
 
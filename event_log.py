@@ -0,0 +1,152 @@
+"""
+Structured game event log - one append-only JSONL file per game, one writer thread.
+
+Every event is a JSON object on its own line with "type" and "ts" keys:
+    line      - a transcript line as printed (what games/game_<ts>.txt used to hold)
+    entry     - a LogEntry appended to the game state (turn, phase, actor, action, content, log)
+    announce  - narrator TTS text
+    llm       - one model call: player, phase, turn, prompt, response, parsed (the turn, or null)
+    player    - a player at setup: name, voice, role
+    game_end  - winner and turns
+
+Callers only enqueue; the writer thread serializes and writes in batches (one write + flush
+per EVENT_LOG_FLUSH_INTERVAL) and fsyncs every EVENT_LOG_FSYNC_INTERVAL and on close.
+
+Render a log back to text:
+    python event_log.py games/game_<ts>.jsonl              # transcript
+    python event_log.py games/game_<ts>.jsonl --history logs  # per-player <name>_history.txt files
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import argparse
+import threading
+from typing import Iterator, Optional
+
+from config import EVENT_LOG_FLUSH_INTERVAL, EVENT_LOG_FSYNC_INTERVAL
+from json_extract import extract_payload
+
+_STOP = object()
+_MAX_BATCH = 1000
+
+
+class EventLog:
+    def __init__(self, path: str, flush_interval: float = EVENT_LOG_FLUSH_INTERVAL,
+                 fsync_interval: float = EVENT_LOG_FSYNC_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="event-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, event_type: str, **fields):
+        """Queue an event. Never blocks on disk."""
+        if self._closed:
+            return
+        self._queue.put({"type": event_type, "ts": round(time.time(), 3), **fields})
+
+    def _writer(self):
+        last_fsync = time.monotonic()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Gather whatever else arrives within the flush window into the same write
+            window_end = time.monotonic() + self.flush_interval
+            while len(batch) < _MAX_BATCH and batch[-1] is not _STOP:
+                remaining = window_end - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is _STOP
+            lines = [json.dumps(event, ensure_ascii=False) for event in batch if event is not _STOP]
+            if lines:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+            if stopping or time.monotonic() - last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                last_fsync = time.monotonic()
+
+    def close(self):
+        """Write out everything queued, fsync and close. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)  # Drop the reference so a closed log can be garbage collected
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+
+
+def read_events(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def format_response(response: str, parsed: Optional[dict] = None) -> str:
+    """Readable STRATEGY/SPEECH/VOTE view of a model response (raw text if it does not parse).
+
+    `parsed` is the turn the client already parsed; the response is only parsed here when it is missing.
+    """
+    data = parsed
+    if data is None:
+        try:
+            data = extract_payload(response)
+        except ValueError:
+            return response
+    if isinstance(data, dict) and "strategy" in data:
+        return (
+            f"STRATEGY: {data.get('strategy')}\n"
+            f"SPEECH:   {data.get('speech')}\n"
+            f"VOTE:     {data.get('vote')}"
+        )
+    return response
+
+
+def render_history(event: dict) -> str:
+    """One llm event in the <player>_history.txt layout."""
+    return (f"\n--- {event['phase']} {event['turn']} ---\nPROMPT:\n{event['prompt']}\n\n"
+            f"RESPONSE:\n{format_response(event['response'], event.get('parsed'))}\n\n" + "-" * 80 + "\n")
+
+
+def write_histories(path: str, out_dir: str, player: Optional[str] = None):
+    """Recreate per-player <name>_history.txt files from the llm events of a game log."""
+    os.makedirs(out_dir, exist_ok=True)
+    histories = {}
+    for event in read_events(path):
+        if event["type"] == "llm" and (player is None or event["player"] == player):
+            histories.setdefault(event["player"], []).append(render_history(event))
+    for name, chunks in histories.items():
+        with open(os.path.join(out_dir, f"{name}_history.txt"), "w", encoding="utf-8") as f:
+            f.write("".join(chunks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a JSONL game event log as text")
+    parser.add_argument("path", help="games/game_<ts>.jsonl")
+    parser.add_argument("--history", metavar="DIR", help="Write per-player <name>_history.txt files to DIR")
+    parser.add_argument("--player", help="Only this player's history (log name, e.g. 3_Haiku)")
+    args = parser.parse_args()
+
+    if args.history:
+        write_histories(args.path, args.history, args.player)
+        return
+    for event in read_events(args.path):
+        if event["type"] == "game_start":
+            print(event["title"])
+        elif event["type"] == "line":
+            print(event["text"])
+
+
+if __name__ == "__main__":
+    main()
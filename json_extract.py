@@ -0,0 +1,151 @@
+# json_extract.py - Find, repair and parse the JSON object in a model response in one pass
+
+"""
+Model responses wrap their JSON in all sorts of things: markdown fences, a sentence of
+preamble, emoji, or a CLI envelope (Claude prints {"type": "result", "result": "<text>"},
+Qwen a list of events with one such "result"). extract_payload() handles all of them:
+
+    parse    JSONDecoder.raw_decode from the first "{" or "[": one C-speed pass that stops at
+             the end of the first value, so fences and trailing text never need stripping
+             (non-strict, so raw newlines in strings are fine)
+    repair   on a decode error, fix the text at the error position and decode again: missing
+             commas, trailing/doubled commas, Python True/False/None, and truncated output
+             (unterminated string, missing value, unclosed brackets)
+    skip     brackets that are not the payload ("[thinking]", "{name}") - try the next one
+    unwrap   a CLI "result" string is extracted the same way
+
+SpeechStream pulls the "speech" field out of a response while it is still streaming.
+
+Benchmark against the old parser with: python bench_json_extract.py
+"""
+
+import re
+import json
+from typing import Any, Callable, Optional
+
+_START = re.compile(r"[{\[]")
+# String literals (skipped whole) and brackets, for finding what a truncated response left open
+_BRACKETS = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]', re.DOTALL)
+_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)  # Rest of a string literal after its opening quote
+_CLOSERS = {"{": "}", "[": "]"}
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_DECODER = json.JSONDecoder(strict=False)
+_MAX_REPAIRS = 20
+
+
+def open_brackets(text: str, start: int = 0) -> str:
+    """The brackets that would close everything opened in text[start:] ("" if balanced or mismatched)."""
+    stack = []
+    for match in _BRACKETS.finditer(text, start):
+        token = match.group()
+        if token in _CLOSERS:
+            stack.append(_CLOSERS[token])
+        elif token[0] != '"' and (not stack or stack.pop() != token):
+            return ""
+    return "".join(reversed(stack))
+
+
+def repair_at(text: str, start: int, error: json.JSONDecodeError) -> Optional[str]:
+    """text with the error the decoder stopped at fixed, or None if it is not one we can fix."""
+    pos, msg = error.pos, error.msg
+    if msg.startswith("Unterminated string"):
+        return text + '"'
+    if pos >= len(text.rstrip()):
+        # Truncated: finish a dangling key/comma, then close what is still open
+        head = text.rstrip()
+        if head.endswith(","):
+            return head[:-1]
+        if head.endswith(":"):
+            return head + " null"
+        closers = open_brackets(text, start)
+        return text + closers if closers else None
+    if msg.startswith("Expecting ',' delimiter"):
+        return text[:pos] + "," + text[pos:]
+    if msg.startswith(("Expecting property name", "Expecting value")):
+        head = text[:pos].rstrip()
+        if head.endswith(","):
+            return head[:-1] + text[pos:]  # Trailing or doubled comma
+        for literal, value in _LITERALS.items():
+            if text.startswith(literal, pos):
+                return text[:pos] + value + text[pos + len(literal):]
+    return None
+
+
+def _decode_at(text: str, start: int) -> Any:
+    """raw_decode from start, repairing up to _MAX_REPAIRS errors. Raises ValueError."""
+    for _ in range(_MAX_REPAIRS):
+        try:
+            return _DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError as e:
+            repaired = repair_at(text, start, e)
+            if repaired is None:
+                raise
+            text = repaired
+    raise ValueError("Too many JSON errors to repair")
+
+
+def _is_payload(data: Any) -> bool:
+    """A turn object, or a CLI event list holding a "result"; anything else is preamble."""
+    if isinstance(data, list):
+        return any(isinstance(item, dict) and "result" in item for item in data)
+    return isinstance(data, dict)
+
+
+def loads_first(text: str) -> Any:
+    """Parse the first JSON object (or CLI event list) in text, repairing it if needed. Raises ValueError."""
+    position = 0
+    error: Optional[Exception] = None
+    while True:
+        first = _START.search(text, position)
+        if not first:
+            raise error or ValueError("No JSON object found")
+        try:
+            data = _decode_at(text, first.start())
+            if _is_payload(data):
+                return data
+        except ValueError as e:
+            error = error or e
+        position = first.start() + 1  # Preamble like "[thinking]", "{name}" or "[1]": try the next bracket
+
+
+def extract_payload(text: str) -> Any:
+    """The model's JSON from a raw response, unwrapping Claude/Qwen CLI "result" envelopes."""
+    data = loads_first(text)
+    if isinstance(data, list):
+        data = next((item["result"] for item in data
+                     if isinstance(item, dict) and isinstance(item.get("result"), str)), data)
+    elif isinstance(data, dict) and isinstance(data.get("result"), str):
+        data = data["result"]
+    return loads_first(data) if isinstance(data, str) else data
+
+
+class SpeechStream:
+    """Feed streamed response text; calls on_value(text) once, as soon as a string field is complete.
+
+    The turn JSON is written strategy -> speech -> vote, so the speech is known well before
+    the model finishes. Only the field's own string is decoded, nothing else is parsed.
+    """
+
+    def __init__(self, on_value: Callable[[str], None], field: str = "speech"):
+        self.on_value = on_value
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._text = ""
+        self._value_start: Optional[int] = None
+        self.value: Optional[str] = None
+
+    def feed(self, chunk: str):
+        if self.value is not None:
+            return
+        self._text += chunk
+        if self._value_start is None:
+            key = self._key.search(self._text)
+            if not key:
+                return
+            self._value_start = key.end()
+        body = _STRING_BODY.match(self._text, self._value_start)
+        if body:
+            try:
+                self.value = _DECODER.decode('"' + body.group())
+            except ValueError:
+                return
+            self.on_value(self.value)
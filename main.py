@@ -1,17 +1,25 @@
 import sys
 import os
+import time
+import argparse
 from engine import GameEngine
+from mock_llm import mock_roster
+from config import EVENT_LOG_FLUSH_INTERVAL
 
 class Logger(object):
-    def __init__(self):
+    def __init__(self, path):
         self.terminal = sys.stdout
-        os.makedirs("logs", exist_ok=True)
-        self.log = open("logs/full_game_log.txt", "w", encoding="utf-8")
+        self.log = open(path, "w", encoding="utf-8")
+        self.last_flush = time.monotonic()
 
     def write(self, message):
         self.terminal.write(message)
         self.log.write(message)
-        self.log.flush() # Ensure it writes immediately
+        # Buffered: flush at most every EVENT_LOG_FLUSH_INTERVAL instead of on every write
+        now = time.monotonic()
+        if now - self.last_flush >= EVENT_LOG_FLUSH_INTERVAL:
+            self.log.flush()
+            self.last_flush = now
 
     def flush(self):
         # Current implementation of flush to satisfy stream interface
@@ -24,13 +32,26 @@ class Logger(object):
     def fileno(self):
         return self.terminal.fileno()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI Mafia")
+    parser.add_argument("--headless", action="store_true",
+                        help="Batch mode: no TTS, no pauses, no terminal input (cron/containers)")
+    parser.add_argument("--mock", type=int, metavar="N", default=0,
+                        help="Replace the roster with N local mock players (no network, for load tests)")
+    return parser.parse_args()
+
 def main():
-    # Redirect stdout to capture all output
-    sys.stdout = Logger()
+    args = parse_args()
     print("Welcome to AI Mafia! Starting game engine...")
-    engine = GameEngine()
+    roster = mock_roster(args.mock) if args.mock else None
+    engine = GameEngine(headless=args.headless, roster=roster)
+    # Redirect stdout to capture all output (after the engine, which wipes logs/ on start)
+    sys.stdout = Logger(os.path.join(engine.logs_dir, "full_game_log.txt"))
     try:
-        engine.run()
+        if args.headless:
+            engine.run_headless()
+        else:
+            engine.run()
     except KeyboardInterrupt:
         print("\nGame Terminated by User.")
         sys.exit(0)
@@ -38,6 +59,8 @@ def main():
         print(f"\nCRITICAL ERROR: {e}")
         import traceback
         traceback.print_exc()
+        if args.headless:
+            sys.exit(1)  # Non-zero exit so cron/CI notice the failure
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,108 @@
+# metrics.py - Thread-safe latency, prompt-cache and parse-failure tracking for LLM call paths
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+
+class LatencyStats:
+    """Rolling latency samples (seconds) per key, e.g. "claude:warm" or "openrouter:call"."""
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            self._samples[key].append(seconds)
+            self._counts[key] += 1
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return self._counts.get(key, 0)
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        """pct in [0, 100]. None until the key has samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            snapshot = {k: sorted(v) for k, v in self._samples.items() if v}
+            counts = dict(self._counts)
+        result = {}
+        for key, samples in sorted(snapshot.items()):
+            result[key] = {
+                "count": counts[key],
+                "mean": sum(samples) / len(samples),
+                "p50": samples[len(samples) // 2],
+                "p90": samples[min(len(samples) - 1, int(len(samples) * 0.9))],
+                "max": samples[-1],
+            }
+        return result
+
+    def report_lines(self):
+        return [
+            f"{key:<28} n={s['count']:<4} mean={s['mean']:.2f}s p50={s['p50']:.2f}s p90={s['p90']:.2f}s max={s['max']:.2f}s"
+            for key, s in self.summary().items()
+        ]
+
+
+class PromptCacheStats:
+    """Prompt tokens sent and prompt tokens served from the provider's prompt cache, per key."""
+
+    def __init__(self):
+        self._totals = defaultdict(lambda: {"calls": 0, "prompt": 0, "cached": 0})
+        self._lock = threading.Lock()
+
+    def record(self, key: str, prompt_tokens: int, cached_tokens: int):
+        with self._lock:
+            totals = self._totals[key]
+            totals["calls"] += 1
+            totals["prompt"] += prompt_tokens
+            totals["cached"] += cached_tokens
+
+    def hit_rate(self, key: str) -> Optional[float]:
+        """Fraction of prompt tokens read from cache. None until the key has usage."""
+        with self._lock:
+            totals = self._totals.get(key)
+            if not totals or not totals["prompt"]:
+                return None
+            return totals["cached"] / totals["prompt"]
+
+    def report_lines(self):
+        with self._lock:
+            snapshot = {k: dict(v) for k, v in self._totals.items()}
+        return [
+            f"{key:<28} n={t['calls']:<4} prompt={t['prompt']:<8} cached={t['cached']:<8} "
+            f"hit={t['cached'] / t['prompt'] * 100 if t['prompt'] else 0:.0f}%"
+            for key, t in sorted(snapshot.items())
+        ]
+
+
+class ParseStats:
+    """Responses parsed vs rejected as unparseable, per model and output mode (schema, json, text, cli)."""
+
+    def __init__(self):
+        self._totals = defaultdict(lambda: {"responses": 0, "failed": 0})
+        self._lock = threading.Lock()
+
+    def record(self, key: str, mode: str, failed: bool):
+        with self._lock:
+            totals = self._totals[(key, mode)]
+            totals["responses"] += 1
+            totals["failed"] += int(failed)
+
+    def report_lines(self):
+        with self._lock:
+            snapshot = {k: dict(v) for k, v in self._totals.items()}
+        return [
+            f"{key:<36} {mode:<6} n={t['responses']:<4} parse_failures={t['failed']:<3} "
+            f"rate={t['failed'] / t['responses'] * 100:.0f}%"
+            for (key, mode), t in sorted(snapshot.items())
+        ]
@@ -0,0 +1,160 @@
+# mock_llm.py - Deterministic local stand-in LLM for load testing the engine
+
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+from typing import Optional, List
+
+from schemas import GameState
+from config import MOCK_SEED, MOCK_LATENCY, MOCK_FAILURE_RATE, MOCK_MALFORMED_RATE, NARRATOR_VOICE
+
+SPEECHES = [
+    "I've been watching {target} closely and something feels off.",
+    "{target}, your reasoning so far has been thin. Convince me.",
+    "Let's not rush. I trust {target} more than most right now.",
+    "The voting pattern around {target} tells us a lot.",
+    "I'm Town and I want us to focus on who is steering the discussion. {target}?",
+]
+
+DEFENSES = [
+    "I'm not Mafia. Look at my record - I've pushed for real reads all game.",
+    "Voting me out wastes a day. Check who nominated me and why.",
+]
+
+LAST_WORDS = [
+    "Remember my reads: {target} is the one to watch.",
+    "I was Town. Don't let {target} walk away from this.",
+]
+
+
+class MockLLM:
+    """Returns schema-valid TurnOutput JSON chosen from the GameState with a seeded RNG.
+
+    No network or CLI. Latency and failure rates are simulated so engine overhead,
+    concurrency and retry behaviour can be benchmarked in isolation.
+    """
+
+    def __init__(self, seed: Optional[int] = MOCK_SEED, latency=MOCK_LATENCY,
+                 failure_rate: float = MOCK_FAILURE_RATE, malformed_rate: float = MOCK_MALFORMED_RATE):
+        # Derive from the global RNG when unseeded, so random.seed() before a game makes it reproducible
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.latency = latency  # (min_seconds, max_seconds)
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self._call_counts = {}  # player_name -> calls so far
+        self._lock = threading.Lock()
+
+    def _rng_for(self, player_name: str, phase: str, turn_number: int) -> random.Random:
+        """Per-call RNG keyed by player and call index, so concurrent calls stay deterministic."""
+        with self._lock:
+            n = self._call_counts.get(player_name, 0)
+            self._call_counts[player_name] = n + 1
+        return random.Random(f"{self.seed}:{player_name}:{phase}:{turn_number}:{n}")
+
+    def generate(self, player_name: str, phase: str, turn_number: int, system_prompt: str,
+                 turn_prompt: str, game_state: Optional[GameState] = None) -> str:
+        rng = self._rng_for(player_name, phase, turn_number)
+        delay = self._delay(rng)
+        if delay:
+            time.sleep(delay)
+        return self._respond(rng, player_name, phase, system_prompt, turn_prompt, game_state)
+
+    async def agenerate(self, player_name: str, phase: str, turn_number: int, system_prompt: str,
+                        turn_prompt: str, game_state: Optional[GameState] = None) -> str:
+        rng = self._rng_for(player_name, phase, turn_number)
+        delay = self._delay(rng)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(rng, player_name, phase, system_prompt, turn_prompt, game_state)
+
+    def _delay(self, rng: random.Random) -> float:
+        low, high = self.latency
+        return rng.uniform(low, high) if high > 0 else 0.0
+
+    def _respond(self, rng: random.Random, player_name: str, phase: str, system_prompt: str,
+                 turn_prompt: str, game_state: Optional[GameState]) -> str:
+        if rng.random() < self.failure_rate:
+            raise ConnectionError(f"Mock transport failure for {player_name}")
+
+        output = self._choose_turn(rng, player_name, phase, system_prompt, turn_prompt, game_state)
+        text = json.dumps(output)
+        if rng.random() < self.malformed_rate:
+            # Trailing comma + markdown fence: exercises the parser's repair path
+            text = "```json\n" + text[:-1] + ",}\n```"
+        return text
+
+    def _choose_turn(self, rng: random.Random, player_name: str, phase: str, system_prompt: str,
+                     turn_prompt: str, game_state: Optional[GameState]) -> dict:
+        if phase == "Reflection":
+            return {"strategy": "Track vote patterns; defend partners quietly; push the quiet players.",
+                    "speech": "MEMORY_FILE_UPDATE", "vote": None}
+
+        name, role = self._identity(player_name, system_prompt, game_state)
+        living = self._living(turn_prompt, game_state)
+        others = [p for p in living if p != name]
+        if role == "Mafia" and game_state:
+            # Mafia know each other - never target a partner
+            mafia = {p.name for p in game_state.players if p.role == "Mafia"}
+            town = [p for p in others if p not in mafia]
+            others = town or others
+        target = rng.choice(others) if others else None
+        strategy = f"Mock {role} plan: watch {target}." if target else f"Mock {role} plan."
+
+        if phase == "Night":
+            if role in ("Mafia", "Cop"):
+                return {"strategy": strategy, "speech": f"{target} is my pick tonight.", "vote": target}
+            return {"strategy": strategy, "speech": "", "vote": None}
+
+        if phase == "Trial":
+            on_trial = game_state.on_trial if game_state else None
+            if on_trial == name:
+                return {"strategy": strategy, "speech": rng.choice(DEFENSES), "vote": None}
+            nominees = [n for n in self._nominees(game_state) if n != name] if game_state else []
+            vote = rng.choice(nominees) if nominees else target
+            return {"strategy": strategy, "speech": None, "vote": vote}
+
+        if phase == "LastWords":
+            return {"strategy": strategy, "speech": rng.choice(LAST_WORDS).format(target=target), "vote": None}
+
+        # Day: nominations only after Day 1
+        turn = game_state.turn if game_state else 1
+        vote = target if turn > 1 and rng.random() < 0.6 else None
+        return {"strategy": strategy, "speech": rng.choice(SPEECHES).format(target=target), "vote": vote}
+
+    def _identity(self, player_name: str, system_prompt: str, game_state: Optional[GameState]):
+        """Resolve (name, role) from the GameState, falling back to the system prompt."""
+        name = player_name.split("_", 1)[-1]  # log names are "<index>_<name>"
+        if game_state:
+            state = next((p for p in game_state.players if p.name == name), None)
+            if state:
+                return name, state.role
+        match = re.search(r">>> YOU: (.+?) \((\w+)\) <<<", system_prompt)
+        if match:
+            return match.group(1), match.group(2)
+        return name, "Villager"
+
+    def _living(self, turn_prompt: str, game_state: Optional[GameState]) -> List[str]:
+        if game_state:
+            return [p.name for p in game_state.players if p.is_alive]
+        match = re.search(r"^Alive: (.*)$", turn_prompt, re.MULTILINE)
+        return [n.strip() for n in match.group(1).split(",")] if match else []
+
+    def _nominees(self, game_state: GameState) -> List[str]:
+        """Nominees from the latest Trial PhaseStart entry ("Nominees: A (1), B (2) | Voters: 5")."""
+        for log in reversed(game_state.public_logs):
+            if log.phase == "Trial" and log.action == "PhaseStart":
+                listed = log.content.split("|")[0].replace("Nominees:", "")
+                return [re.sub(r"\s*\(\d+\)$", "", n.strip()) for n in listed.split(",") if n.strip()]
+        return []
+
+
+def mock_roster(count: int) -> List[dict]:
+    """ROSTER_CONFIG-style entries for `count` mock players."""
+    return [
+        {"active": True, "use_cli": False, "name": f"Bot{i + 1}", "provider": "mock", "model": "mock",
+         "voice": NARRATOR_VOICE, "role": "random"}
+        for i in range(count)
+    ]
@@ -1,11 +1,40 @@
-from typing import List, Optional
-from schemas import PlayerState, TurnOutput, GameState, LogEntry
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+from schemas import PlayerState, TurnOutput, GameState, LogStore
 from api_clients import UnifiedLLMClient
+from context_manager import ContextManager, chars_per_token, context_budget
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 
+
+class LogRenderCache:
+    """Rendered "[phase] actor: content" lines for one log stream.
+
+    A LogStore is append-only, so each call renders only the entries added since
+    the previous call. The cache resets if the game or the log store changes.
+    """
+
+    def __init__(self):
+        self._reset(None)
+
+    def _reset(self, key):
+        self._key = key
+        self._count = 0          # entries rendered so far
+        self._text = ""
+
+    def render(self, game_state: GameState, logs: LogStore) -> str:
+        key = (game_state.game_id, logs.uid)
+        if key != self._key or len(logs) < self._count:
+            self._reset(key)
+
+        if len(logs) > self._count:
+            self._text += "".join(f"[{phase}] {actor}: {content}\n" for phase, actor, content in logs.lines(self._count))
+            self._count = len(logs)
+        return self._text
+
+
 class Player:
-    def __init__(self, name: str, role: str, provider: str, model_name: str, client: UnifiedLLMClient, player_index: int, use_cli: bool = True, memory_enabled: bool = True):
+    def __init__(self, name: str, role: str, provider: str, model_name: str, client: UnifiedLLMClient, player_index: int, use_cli: bool = True, memory_enabled: bool = True, memory_dir: str = "memories", context: Optional[ContextManager] = None, context_budget_tokens: Optional[int] = None):
         self.state = PlayerState(
             name=name,
             role=role,
@@ -18,11 +47,17 @@ class Player:
         self.partner_name: Optional[str] = None # For mafia to know their partner
         self.memory: str = ""
         self.memory_enabled = memory_enabled
+        # Incremental prompt rendering: one cache per visible log stream
+        self._log_caches = {"public": LogRenderCache(), "mafia": LogRenderCache(), "cop": LogRenderCache()}
+        # Prompt budget: older phases are condensed by the (game-wide) context manager when over it
+        self.context = context or ContextManager()
+        self.context_budget = context_budget(provider, model_name, context_budget_tokens)
+        self._condensed = False
         
         # Load existing memory if available and enabled
         if self.memory_enabled:
             try:
-                with open(f"memories/{name}.txt", "r") as f:
+                with open(os.path.join(memory_dir, f"{name}.txt"), "r") as f:
                     self.memory = f.read().strip()
             except FileNotFoundError:
                 self.memory = ""
@@ -30,13 +65,28 @@ class Player:
     def set_partner(self, partner_name: str):
         self.partner_name = partner_name
 
-    def _build_system_prompt(self, game_state: GameState) -> str:
+    def _build_shared_prefix(self, game_state: GameState, public_log: str) -> List[str]:
+        """Rules + public log: the same for every player in a phase, so it leads the prompt as cacheable blocks.
+
+        Split where the current phase starts: earlier phases stay unchanged while players take turns
+        within a phase, so that block keeps hitting the provider's prompt cache.
+        """
         player_count = len(game_state.players)
         villager_count = player_count - 2 # 2 Mafia
-        prompt = f"""MAFIA GAME.
->>> YOU: {self.state.name} ({self.state.role}) <<<
+        rules = f"""MAFIA GAME.
 {player_count} players: 2 Mafia, {villager_count} Villagers (1 Cop).
 {f"Role revealed on death." if game_state.reveal_role_on_death else "Roles are hidden on death. "} Last words before death.
+
+--- LOG ---
+"""
+        current = self.context.current_phase(game_state.public_logs)
+        if not current or not public_log.endswith(current):
+            return [rules + public_log]
+        return [rules + public_log[:-len(current)], current]
+
+    def _build_system_prompt(self, game_state: GameState) -> str:
+        prompt = f"""
+>>> YOU: {self.state.name} ({self.state.role}) <<<
 """
         # Check if partner is alive
         partner_alive = False
@@ -108,7 +158,24 @@ OUTPUT: JSON only, no backticks.
         
         return prompt
 
-    def _build_turn_prompt(self, game_state: GameState) -> str:
+    def _render_logs(self, game_state: GameState, fixed_chars: int) -> Dict[str, str]:
+        """Visible log streams, condensed if the prompt would go over this model's budget."""
+        streams = {"public": game_state.public_logs}
+        if self.state.role == "Mafia":
+            streams["mafia"] = game_state.mafia_logs
+        if self.state.role == "Cop":
+            streams["cop"] = game_state.cop_logs
+
+        budget_chars = None
+        if self.context_budget is not None:
+            budget_chars = max(0, int(self.context_budget * chars_per_token(self.state.provider)) - fixed_chars)
+        fitted = self.context.fit(streams, budget_chars)
+        self._condensed = any(text is not None for text in fitted.values())
+        return {name: fitted[name] if fitted[name] is not None else self._log_caches[name].render(game_state, logs)
+                for name, logs in streams.items()}
+
+    def _build_turn_prompt(self, game_state: GameState, fixed_chars: int = 0) -> Tuple[str, str]:
+        """(public log, turn prompt). The public log is sent in the shared prefix, not in the turn prompt."""
         # 1. Living Players
         living_states = [p for p in game_state.players if p.is_alive]
         living = [p.name for p in living_states]
@@ -127,24 +194,11 @@ OUTPUT: JSON only, no backticks.
             elif game_state.phase == "Night" and len(living) == 2 * mafia_count + 2 and mafia_count > 0:
                 prompt += f"WARNING: Next Day is LYLO ({mafia_count} Mafia / {len(living)-1} expected alive)! Tonight is critical.\n\n"
 
-        # 2. Logs
-        prompt += "--- LOG ---\n"
-        for log in game_state.public_logs:
-            prompt += f"[{log.phase}] {log.actor}: {log.content}\n"
-
-        # 3. Mafia Secrets
-        if self.state.role == "Mafia":
-            prompt += "\n--- MAFIA LOG ---\n"
-            for log in game_state.mafia_logs:
-                prompt += f"[{log.phase}] {log.actor}: {log.content}\n"
-
-        # 4. Cop Secrets
-        if self.state.role == "Cop":
-            prompt += "\n--- SECRET INVESTIGATION LOG ---\n"
-            for log in game_state.cop_logs:
-                prompt += f"[{log.phase}] {log.actor}: {log.content}\n"
+        # 2-4. Logs are rendered last, once the size of everything else is known
+        head = prompt
 
         # 5. Strategy
+        prompt = ""
         if self.state.strategy:
             prompt += "\n--- PREV STRATEGY (update) ---\n"
             prompt += f"{self.state.strategy}\n"
@@ -182,36 +236,83 @@ OUTPUT: JSON only, no backticks.
                  prompt += "\nUse 'vote' to nominate a suspect for trial (PlayerName ONLY or null)."
              prompt += "\n"
 
-        return prompt
+        logs = self._render_logs(game_state, fixed_chars + len(head) + len(prompt) + 100)
+
+        # 2. Public log -> shared prefix
+        body = head.rstrip("\n") + "\n"
 
-    def take_turn(self, game_state: GameState, turn_number: int) -> TurnOutput:
+        # 3. Mafia Secrets
+        if "mafia" in logs:
+            body += "\n--- MAFIA LOG ---\n" + logs["mafia"]
+
+        # 4. Cop Secrets
+        if "cop" in logs:
+            body += "\n--- SECRET INVESTIGATION LOG ---\n" + logs["cop"]
+
+        return logs["public"], body + prompt
+
+    def _build_prompts(self, game_state: GameState) -> Tuple[List[str], str]:
+        """System prompt blocks (shared prefix first, then this player's part) and the turn prompt."""
         system_prompt = self._build_system_prompt(game_state)
-        turn_prompt = self._build_turn_prompt(game_state)
-        
-        # Pass numbered name for file logging, but models use real name in prompt
-        log_name = f"{self.player_index}_{self.state.name}"
-        
-        output = self.client.generate_turn(
-            player_name=log_name,
+        public_log, turn_prompt = self._build_turn_prompt(game_state, len(system_prompt) + 300)
+        return self._build_shared_prefix(game_state, public_log) + [system_prompt], turn_prompt
+
+    def _turn_request(self, game_state: GameState, turn_number: int) -> dict:
+        """Keyword arguments for client.generate_turn / agenerate_turn."""
+        system_prompt, turn_prompt = self._build_prompts(game_state)
+        self.context.record(self.state.provider, sum(map(len, system_prompt)) + len(turn_prompt), self._condensed)
+        return dict(
+            # Pass numbered name for file logging, but models use real name in prompt
+            player_name=f"{self.player_index}_{self.state.name}",
             provider=self.state.provider,
             model_name=self.state.model_name,
             system_prompt=system_prompt,
             turn_prompt=turn_prompt,
             turn_number=turn_number,
             phase=game_state.phase,
-            use_cli=self.state.use_cli
+            use_cli=self.state.use_cli,
+            game_state=game_state
         )
 
+    def _apply_output(self, output: TurnOutput) -> TurnOutput:
         # Update strategy (overwrites)
         if output.strategy:
             self.state.strategy = output.strategy
-        
         return output
 
+    def take_turn(self, game_state: GameState, turn_number: int,
+                  on_speech: Optional[Callable[[str], None]] = None) -> TurnOutput:
+        """on_speech(speech) is called as soon as the speech has streamed in (see generate_turn)."""
+        output = self.client.generate_turn(**self._turn_request(game_state, turn_number), on_speech=on_speech)
+        return self._apply_output(output)
+
+    async def atake_turn(self, game_state: GameState, turn_number: int) -> TurnOutput:
+        """Coroutine version of take_turn (shares one event loop with other players/games)."""
+        output = await self.client.agenerate_turn(**self._turn_request(game_state, turn_number))
+        return self._apply_output(output)
+
     def reflect_on_game(self, game_state: GameState, winner: str) -> str:
         """
         Ask the model to reflect on the game and update its memory file.
         """
+        try:
+            output = self.client.generate_turn(**self._reflection_request(game_state, winner))
+            return output.strategy.strip()
+        except Exception as e:
+            print(f"Error generating memory for {self.state.name}: {e}")
+            return self.memory # Return old memory on failure
+
+    async def areflect_on_game(self, game_state: GameState, winner: str) -> str:
+        """Coroutine version of reflect_on_game."""
+        try:
+            output = await self.client.agenerate_turn(**self._reflection_request(game_state, winner))
+            return output.strategy.strip()
+        except Exception as e:
+            print(f"Error generating memory for {self.state.name}: {e}")
+            return self.memory # Return old memory on failure
+
+    def _reflection_request(self, game_state: GameState, winner: str) -> dict:
+        """Keyword arguments for client.generate_turn / agenerate_turn for the reflection call."""
         system_prompt = f"""You are {self.state.name}, a player in a Mafia game.
 The game is over.
 Winner: {winner}
@@ -249,9 +350,7 @@ Output ONLY the memory text. Do not output JSON.
         # Use the existing client which enforces the TurnOutput schema (strategy, speech, vote).
         # We repurpose these fields for the reflection phase.
         
-        log_name = f"{self.player_index}_{self.state.name}"
-        try:
-            system_prompt = f"""You are {self.state.name}, a player in a Mafia game.
+        system_prompt = f"""You are {self.state.name}, a player in a Mafia game.
 The game is over.
 Winner: {winner}
 Your Role: {self.state.role}
@@ -276,23 +375,18 @@ IMPORTANT:
 OUTPUT: JSON only, no backticks.
 {"strategy": "YOUR_MEMORY_TEXT_HERE", "speech": "MEMORY_FILE_UPDATE", "vote": null}
 """
-            
-            output = self.client.generate_turn(
-                player_name=log_name,
-                provider=self.state.provider,
-                model_name=self.state.model_name,
-                system_prompt=system_prompt,
-                turn_prompt=turn_prompt,
-                turn_number=999,
-                phase="Reflection",
-                use_cli=self.state.use_cli
-            )
-            
-            return output.strategy.strip()
 
-        except Exception as e:
-            print(f"Error generating memory for {self.state.name}: {e}")
-            return self.memory # Return old memory on failure
+        return dict(
+            player_name=f"{self.player_index}_{self.state.name}",
+            provider=self.state.provider,
+            model_name=self.state.model_name,
+            system_prompt=system_prompt,
+            turn_prompt=turn_prompt,
+            turn_number=999,
+            phase="Reflection",
+            use_cli=self.state.use_cli,
+            game_state=game_state
+        )
 
 
 class HumanPlayer(Player):
@@ -343,8 +437,9 @@ class HumanPlayer(Player):
             print("✓ Skipped")
             return None
 
-    def take_turn(self, game_state: GameState, turn_number: int) -> TurnOutput:
-        """Prompt human for speech and vote based on phase/role"""
+    def take_turn(self, game_state: GameState, turn_number: int,
+                  on_speech: Optional[Callable[[str], None]] = None) -> TurnOutput:
+        """Prompt human for speech and vote based on phase/role (on_speech is unused: input is not streamed)"""
         phase = game_state.phase
 
         # Villager sleeps at night - no input needed
@@ -0,0 +1,119 @@
+# mp3_utils.py - MP3 frame-level helpers (join clips without ffmpeg, measure duration)
+
+"""
+Edge TTS returns plain MPEG audio frames, and every clip of a game has the same format
+(24 kHz mono). Joining clips is therefore just joining their frames. Tags are stripped
+(ID3v2 at the front, ID3v1 at the back), and so is a Xing/Info header frame, which would
+otherwise tell players the joined file is as long as its first part.
+
+id3_chapters() builds an ID3v2.3 tag with a table of contents (CTOC) and one CHAP frame
+per chapter, the chapter format podcast players read.
+"""
+
+import struct
+from typing import Iterable, Iterator, List, Tuple
+
+# Layer III bitrates (kbps) by bitrate index, for MPEG-1 and MPEG-2/2.5
+_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5) and rate index
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _id3v2_size(data: bytes) -> int:
+    """Bytes taken by an ID3v2 tag at the start of data (0 if there is none)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _frame_header(data: bytes, pos: int) -> Tuple[int, int, int]:
+    """(frame length, samples per frame, sample rate) of a Layer III frame at pos, or (0, 0, 0)."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return 0, 0, 0
+    version = (data[pos + 1] >> 3) & 0x03
+    layer = (data[pos + 1] >> 1) & 0x03
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 0x03
+    padding = (data[pos + 2] >> 1) & 0x01
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return 0, 0, 0  # Reserved, not Layer III, free-format or bad values
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    bitrate = _BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    samples = 1152 if version == 3 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def frames(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """(offset, length, samples, sample rate) for each audio frame.
+
+    Skips tags, junk between frames and a leading Xing/Info header frame (it holds no audio).
+    """
+    pos = _id3v2_size(data)
+    end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+    first = True
+    while pos < end:
+        length, samples, sample_rate = _frame_header(data, pos)
+        if not length or pos + length > end:
+            pos = data.find(b"\xff", pos + 1, end)  # Resync on the next possible frame
+            if pos < 0:
+                return
+            continue
+        header = data[pos:pos + min(length, 64)]
+        if not (first and (b"Xing" in header or b"Info" in header)):
+            yield pos, length, samples, sample_rate
+        first = False
+        pos += length
+
+
+def audio_frames(data: bytes) -> bytes:
+    """The MPEG frames of a clip as one buffer: no tags, no Xing/Info header frame."""
+    return b"".join(data[offset:offset + length] for offset, length, _, _ in frames(data))
+
+
+def concat(clips: Iterable[bytes]) -> bytes:
+    """Join MP3 clips of the same format into one playable MP3."""
+    return b"".join(audio_frames(clip) for clip in clips)
+
+
+def duration(data: bytes) -> float:
+    """Playing time of an MP3 buffer in seconds."""
+    return sum(samples / sample_rate for _, _, samples, sample_rate in frames(data))
+
+
+def concat_files(paths: List[str], output_path: str):
+    clips = []
+    for path in paths:
+        with open(path, "rb") as f:
+            clips.append(f.read())
+    with open(output_path, "wb") as f:
+        f.write(concat(clips))
+
+
+def _syncsafe(n: int) -> bytes:
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+
+def _id3_frame(frame_id: str, body: bytes) -> bytes:
+    return frame_id.encode("ascii") + struct.pack(">I", len(body)) + b"\0\0" + body
+
+
+def _id3_text(frame_id: str, text: str) -> bytes:
+    return _id3_frame(frame_id, b"\x01" + text.encode("utf-16"))  # UTF-16 with BOM
+
+
+def id3_chapters(title: str, chapters: List[Tuple[str, int, int]]) -> bytes:
+    """ID3v2.3 tag: title plus (chapter title, start ms, end ms) chapters, at most 255."""
+    chapters = chapters[:255]
+    element_ids = [f"chp{i}".encode("ascii") + b"\0" for i in range(len(chapters))]
+    frames = [_id3_text("TIT2", title),
+              _id3_frame("CTOC", b"toc\0" + bytes([0x03, len(chapters)]) + b"".join(element_ids))]  # Top-level, ordered
+    for element_id, (chapter_title, start_ms, end_ms) in zip(element_ids, chapters):
+        frames.append(_id3_frame("CHAP", element_id + struct.pack(">IIII", start_ms, end_ms, 0xFFFFFFFF, 0xFFFFFFFF)
+                                 + _id3_text("TIT2", chapter_title)))
+    body = b"".join(frames)
+    return b"ID3\x03\x00\x00" + _syncsafe(len(body)) + body
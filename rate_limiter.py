@@ -0,0 +1,136 @@
+# rate_limiter.py - Per-provider/model concurrency + request-rate governor shared by every call path
+
+import time
+import asyncio
+import threading
+import contextlib
+from typing import Dict, List, Optional, Tuple
+
+from config import PROVIDER_LIMITS
+
+
+class Gate:
+    """A semaphore (max in-flight calls) plus a token bucket (requests per minute).
+
+    Either limit can be None (unlimited). The bucket holds up to `burst` tokens and
+    refills at rpm / 60 per second; each call takes one token before it starts.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, rpm: Optional[float] = None, burst: Optional[int] = None):
+        self.concurrency = concurrency
+        self.rpm = rpm
+        self.burst = burst or (max(1, int(rpm // 6)) if rpm else None)  # ~10s worth of requests
+        self._semaphore = threading.BoundedSemaphore(concurrency) if concurrency else None
+        self._tokens = float(self.burst or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take_token(self) -> float:
+        """Take a token if one is available. Returns 0, or the seconds until one will be."""
+        if not self.rpm:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rpm / 60.0
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / rate
+
+    def acquire(self):
+        while True:
+            wait = self._take_token()
+            if not wait:
+                break
+            time.sleep(wait)
+        if self._semaphore:
+            self._semaphore.acquire()
+
+    async def aacquire(self):
+        """Same as acquire but yields to the event loop instead of blocking the thread."""
+        while True:
+            wait = self._take_token()
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        if self._semaphore:
+            while not self._semaphore.acquire(blocking=False):
+                await asyncio.sleep(0.02)
+
+    def release(self):
+        if self._semaphore:
+            self._semaphore.release()
+
+
+class ProviderGovernor:
+    """Gates every LLM call on its provider limit and, if one is set, its model limit.
+
+    Limits come from config.PROVIDER_LIMITS (keyed by provider, or "provider/model"),
+    overridden per model by "max_concurrency" / "rpm" keys on ROSTER_CONFIG entries.
+    Both gates are acquired, so a free-tier model can be throttled harder than the
+    rest of its provider.
+    """
+
+    def __init__(self, limits: Dict[str, dict] = PROVIDER_LIMITS):
+        self.limits = limits
+        self._model_overrides: Dict[Tuple[str, str], dict] = {}
+        self._gates: Dict[str, Gate] = {}
+        self._lock = threading.Lock()
+
+    def configure_roster(self, roster: List[dict]):
+        """Register per-model overrides from ROSTER_CONFIG-style entries."""
+        with self._lock:
+            for entry in roster:
+                override = {k: entry[k] for k in ("max_concurrency", "rpm") if entry.get(k) is not None}
+                if override:
+                    self._model_overrides[(entry["provider"], entry["model"])] = override
+                    # Rebuild the model gate with the new limits on next use
+                    self._gates.pop(f"{entry['provider']}/{entry['model']}", None)
+
+    def _gate(self, key: str, limit: Optional[dict]) -> Optional[Gate]:
+        if not limit:
+            return None
+        with self._lock:
+            gate = self._gates.get(key)
+            if gate is None:
+                gate = Gate(limit.get("max_concurrency"), limit.get("rpm"), limit.get("burst"))
+                self._gates[key] = gate
+            return gate
+
+    def gates_for(self, provider: str, model: str) -> List[Gate]:
+        provider_limit = self.limits.get(provider, self.limits.get("default"))
+        model_key = f"{provider}/{model}"
+        model_limit = self._model_overrides.get((provider, model)) or self.limits.get(model_key)
+        gates = [self._gate(provider, provider_limit), self._gate(model_key, model_limit)]
+        return [g for g in gates if g]
+
+    @contextlib.contextmanager
+    def slot(self, provider: str, model: str):
+        """Blocks until the call may start; holds the concurrency slots while it runs."""
+        acquired = []
+        try:
+            for gate in self.gates_for(provider, model):
+                gate.acquire()
+                acquired.append(gate)
+            yield
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, provider: str, model: str):
+        acquired = []
+        try:
+            for gate in self.gates_for(provider, model):
+                await gate.aacquire()
+                acquired.append(gate)
+            yield
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+
+# One governor per process so every client, thread and coroutine shares the same limits
+governor = ProviderGovernor()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Render a finished game's event log to one narrated MP3 with chapters, offline.
+
+Every line the live game speaks is synthesized: narrator announcements, player speeches
+with their names announced, nominations and night actions. The lines go through
+TTSEngine with the players' own voices and the shared clip cache (tts_cache.py), all
+submitted at once to its synthesis loop, so the render takes as long as the synthesis
+backlog rather than the game's playing time. Chapters (ID3 CHAP/CTOC) mark each
+Day, Night and Trial.
+
+    python render_replay.py games/game_<ts>.jsonl                  # -> games/game_<ts>.mp3
+    python render_replay.py games/game_<ts>.jsonl -o replay.mp3 --workers 16 --public-only
+"""
+
+import os
+import re
+import time
+import argparse
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import mp3_utils
+from audio_backends import NullBackend
+from config import NARRATOR_VOICE, ROSTER_CONFIG
+from event_log import read_events
+from tts_engine import TTSEngine
+
+# Leading action tags of logged speech, spoken after the speech as in the live game
+_ACTION_TAG = re.compile(r"^\[(Nominated|Suggests killing|Investigates) ([^\]]+)\]\s*")
+_OTHER_TAGS = re.compile(r"^(?:\[[^\]]*\]\s*)+")  # [Defense], [Last Words], [No investigation]
+_SPOKEN_ACTIONS = {
+    "Nominated": "{actor} nominates {target}.",
+    "Suggests killing": "{actor} suggests killing {target}.",
+    "Investigates": "{actor} investigating {target}.",
+}
+_SPOKEN = {"speak", "whisper", "investigate"}
+
+
+class Line(NamedTuple):
+    text: str
+    speaker: Optional[str]  # Player name (announced before the line), None for the narrator
+
+
+def spoken_text(actor: str, content: str) -> str:
+    """What the live game said for a logged speech: the speech, then its action."""
+    action = ""
+    tag = _ACTION_TAG.match(content)
+    if tag:
+        action = _SPOKEN_ACTIONS[tag.group(1)].format(actor=actor, target=tag.group(2))
+        content = content[tag.end():]
+    speech = _OTHER_TAGS.sub("", content).strip()
+    return f"{speech} {action}".strip()
+
+
+def build_script(events: List[dict], public_only: bool = False) -> Tuple[List[Line], List[Tuple[str, int]], Dict[str, str]]:
+    """(lines, chapters as (title, first line index), player voices) from a game's events."""
+    lines: List[Line] = []
+    chapters: List[Tuple[str, int]] = []
+    voices: Dict[str, str] = {}
+    for event in events:
+        if event["type"] == "player":
+            voices[event["name"]] = event["voice"]
+        elif event["type"] == "announce":
+            lines.append(Line(event["text"], None))
+        elif event["type"] == "entry":
+            if event["actor"] == "System":
+                if event["action"] == "PhaseStart" and event["log"] == "public":
+                    chapters.append((f"{event['phase']} {event['turn']}", len(lines)))
+            elif event["action"] in _SPOKEN and not (public_only and event["log"] != "public"):
+                text = spoken_text(event["actor"], event["content"])
+                if text:
+                    lines.append(Line(text, event["actor"]))
+    return lines, chapters, voices
+
+
+def player_voices(lines: List[Line], logged: Dict[str, str]) -> Dict[str, str]:
+    """Voice per speaker: from the log, else ROSTER_CONFIG, else a roster voice per new name (or the narrator's)."""
+    roster = {c["name"]: c["voice"] for c in ROSTER_CONFIG if c.get("voice")}
+    spare = sorted(set(roster.values()))
+    voices = {}
+    for speaker in dict.fromkeys(line.speaker for line in lines if line.speaker):
+        fallback = spare[len(voices) % len(spare)] if spare else NARRATOR_VOICE
+        voices[speaker] = logged.get(speaker) or roster.get(speaker) or fallback
+    return voices
+
+
+def render(path: str, output: str, workers: int, public_only: bool = False) -> bool:
+    events = list(read_events(path))
+    lines, chapters, logged_voices = build_script(events, public_only)
+    if not lines:
+        print(f"Nothing to render in {path}")
+        return False
+
+    tts = TTSEngine(enabled=True, backend=NullBackend(), max_concurrent=workers)
+    if not tts.enabled:
+        print("edge-tts is needed to render replays. Run: pip install edge-tts")
+        return False
+    for name, voice in player_voices(lines, logged_voices).items():
+        tts.register_player(name, voice)
+
+    start = time.monotonic()
+    # Everything is queued up front; the synthesis loop runs `workers` requests at a time
+    futures = [tts.submit_audio(line.text, line.speaker, NARRATOR_VOICE if line.speaker is None else None,
+                                announce_name=line.speaker is not None) for line in lines]
+    clips, offsets_ms, elapsed_ms, failed = [], [], 0, 0
+    for index, future in enumerate(futures):
+        offsets_ms.append(int(elapsed_ms))
+        audio = future.result()
+        if not audio:
+            failed += 1
+            continue
+        frames = mp3_utils.audio_frames(audio)
+        clips.append(frames)
+        elapsed_ms += mp3_utils.duration(frames) * 1000
+        print(f"\r[Replay] {index + 1}/{len(lines)} lines", end="", flush=True)
+    print()
+    tts.close()
+    if not clips:
+        print(f"[Replay] No line of {path} could be synthesized")
+        return False
+
+    # Chapter i runs from its first line to the next chapter (or the end)
+    if not chapters or chapters[0][1] > 0:
+        chapters.insert(0, ("Setup", 0))
+    bounds = [offsets_ms[first] if first < len(offsets_ms) else int(elapsed_ms) for _, first in chapters]
+    bounds.append(int(elapsed_ms))
+    chapter_times = [(title, bounds[i], bounds[i + 1]) for i, (title, _) in enumerate(chapters)]
+
+    title = events[0].get("title", os.path.basename(path)).strip("= ") if events else os.path.basename(path)
+    with open(output, "wb") as f:
+        f.write(mp3_utils.id3_chapters(title, chapter_times))
+        f.write(b"".join(clips))
+
+    minutes, seconds = divmod(int(elapsed_ms / 1000), 60)
+    print(f"[Replay] {output}: {len(clips)} lines, {len(chapter_times)} chapters, {minutes}:{seconds:02d} long, "
+          f"rendered in {time.monotonic() - start:.1f}s" + (f" ({failed} lines failed)" if failed else ""))
+    for line in tts.cache_report():
+        print(f"[TTS Cache] {line}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a game event log to a narrated, chaptered MP3")
+    parser.add_argument("path", help="games/game_<ts>.jsonl")
+    parser.add_argument("-o", "--output", help="Output MP3 (default: next to the log)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Lines synthesized at once (default: CPU count)")
+    parser.add_argument("--public-only", action="store_true", help="Leave out Mafia and Cop night talk")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.path)[0] + ".mp3"
+    if not render(args.path, output, args.workers, args.public_only):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# retry_policy.py - Error classification and backoff for LLM turn retries
+
+import re
+import random
+import subprocess
+import httpx
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import RETRY_POLICY
+
+# Error kinds
+PARSE = "parse"            # Model answered but the JSON/schema was bad - ask again right away
+RATE_LIMIT = "rate_limit"  # 429 / quota - wait, honoring Retry-After when the server sends one
+TRANSPORT = "transport"    # Network, timeout, 5xx - short exponential backoff
+CLI_EXIT = "cli_exit"      # CLI exited non-zero (crash, auth hiccup, provider error)
+FATAL = "fatal"            # Bad key, unknown model, bad request, missing CLI - retrying cannot help
+
+RATE_LIMIT_PATTERN = re.compile(r"\b429\b|rate.?limit|too many requests|quota|resource.?exhausted", re.IGNORECASE)
+
+
+class TurnParseError(ValueError):
+    """The model replied, but the reply could not be parsed into a TurnOutput."""
+
+
+class ConfigError(ValueError):
+    """The player cannot be called as configured (missing API key, unknown provider, no CLI mapped)."""
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    # openai/anthropic: .status_code, google-genai: .code
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_bad_request(exc: Exception) -> bool:
+    """HTTP 400: the request itself was rejected (e.g. a parameter the model does not support)."""
+    return _status_code(exc) == 400
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """Seconds from a Retry-After (or retry-after-ms) response header, if the error carries one."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP-date form
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(exc: Exception) -> str:
+    """Map an exception from a model call to one of the error kinds above."""
+    if isinstance(exc, TurnParseError):
+        return PARSE
+
+    if isinstance(exc, subprocess.CalledProcessError):
+        output = f"{exc.stderr or ''}\n{exc.output or ''}"
+        return RATE_LIMIT if RATE_LIMIT_PATTERN.search(output) else CLI_EXIT
+
+    # CLI binary not installed / not executable, or a configuration mistake
+    if isinstance(exc, (ConfigError, FileNotFoundError, PermissionError)):
+        return FATAL
+
+    status = _status_code(exc)
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None and (status >= 500 or status == 408):
+        return TRANSPORT
+    if status is not None and 400 <= status < 500:
+        return FATAL
+
+    if isinstance(exc, (subprocess.TimeoutExpired, OSError, httpx.TransportError)):
+        return TRANSPORT
+
+    name = type(exc).__name__
+    if "RateLimit" in name:
+        return RATE_LIMIT
+    if "Connection" in name or "Timeout" in name:
+        return TRANSPORT
+    # Anything else is most likely a bug or a misconfiguration: retrying would repeat it
+    return RATE_LIMIT if RATE_LIMIT_PATTERN.search(str(exc)) else FATAL
+
+
+class RetryPolicy:
+    """How many attempts a turn gets and how long to wait between them.
+
+    Parse failures are retried immediately (up to max_parse_retries extra attempts),
+    other failures back off exponentially with full jitter: a random delay in
+    [0, min(max_delay, base * 2**n)]. Rate limits use a larger base and never wait
+    less than the server's Retry-After.
+    """
+
+    def __init__(self, max_attempts: int = RETRY_POLICY["max_attempts"],
+                 max_parse_retries: int = RETRY_POLICY["max_parse_retries"],
+                 base_delay: float = RETRY_POLICY["base_delay"],
+                 rate_limit_base_delay: float = RETRY_POLICY["rate_limit_base_delay"],
+                 max_delay: float = RETRY_POLICY["max_delay"],
+                 rng: Optional[random.Random] = None):
+        self.max_attempts = max_attempts
+        self.max_parse_retries = max_parse_retries
+        self.base_delay = base_delay
+        self.rate_limit_base_delay = rate_limit_base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def next_delay(self, exc: Exception, kind: str, failures: dict) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up.
+
+        `failures` is the per-turn {kind: count} tally including this failure.
+        """
+        total = sum(failures.values())
+        if kind == FATAL:
+            return None
+        if kind == PARSE:
+            if failures[PARSE] > self.max_parse_retries:
+                return None
+            return 0.0
+        # Parse retries do not eat into the transport/rate-limit budget
+        if total - failures.get(PARSE, 0) >= self.max_attempts:
+            return None
+
+        n = total - failures.get(PARSE, 0) - 1
+        base = self.rate_limit_base_delay if kind == RATE_LIMIT else self.base_delay
+        delay = self.rng.uniform(0, min(self.max_delay, base * (2 ** n)))
+        if kind == RATE_LIMIT:
+            server_wait = retry_after(exc)
+            if server_wait is not None:
+                delay = max(delay, min(server_wait, self.max_delay))
+        return delay
@@ -1,5 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+import sys
+import itertools
+import threading
+from array import array
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Iterable, Iterator, List, Optional, Literal, Tuple
 from uuid import uuid4
 
 class TurnOutput(BaseModel):
@@ -7,12 +11,118 @@ class TurnOutput(BaseModel):
     speech: Optional[str] = Field("", description="Public statement to the town (max 75 words)")
     vote: Optional[str] = Field(None, description="Name of player to vote for (or None if not voting phase)")
 
-class LogEntry(BaseModel):
-    turn: int
-    phase: str
-    actor: str
-    action: str  # speak, vote, kill, die, system
-    content: str
+class LogEntry:
+    """One game log line. Plain __slots__ object: built for every logged event, so no validation overhead."""
+    __slots__ = ("turn", "phase", "actor", "action", "content")
+
+    def __init__(self, turn: int, phase: str, actor: str, action: str, content: str):
+        self.turn = turn
+        self.phase = sys.intern(phase)
+        self.actor = sys.intern(actor)
+        self.action = sys.intern(action)  # speak, vote, kill, die, system
+        self.content = content
+
+    def __eq__(self, other):
+        return isinstance(other, LogEntry) and all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return f"LogEntry(turn={self.turn}, phase={self.phase!r}, actor={self.actor!r}, action={self.action!r}, content={self.content!r})"
+
+
+class _Interner:
+    """Process-wide string <-> small int table (phases, actors and actions repeat on every line)."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(sys.intern(value))
+                    self._codes[value] = code
+        return code
+
+
+PHASES = _Interner()
+ACTORS = _Interner()
+ACTIONS = _Interner()  # Integer action enum, grows as new action names appear
+_store_ids = itertools.count()
+
+
+class LogStore:
+    """Append-only, column-oriented log: turns and interned phase/actor/action codes in typed
+    arrays, content strings in a list. Reads like a list of LogEntry (len, index, slice,
+    iteration, reversed) but holds ~1 object per line instead of a model instance.
+    """
+
+    def __init__(self, entries: Iterable[LogEntry] = ()):
+        self.uid = next(_store_ids)  # Stable identity for render caches (id() can be reused)
+        self._turns = array("I")
+        self._phases = array("I")
+        self._actors = array("I")
+        self._actions = array("I")
+        self._contents: List[str] = []
+        self.extend(entries)
+
+    def append(self, entry: LogEntry):
+        self._turns.append(entry.turn)
+        self._phases.append(PHASES.code(entry.phase))
+        self._actors.append(ACTORS.code(entry.actor))
+        self._actions.append(ACTIONS.code(entry.action))
+        self._contents.append(entry.content)
+
+    def extend(self, entries: Iterable[LogEntry]):
+        for entry in entries:
+            self.append(entry)
+
+    def _entry(self, i: int) -> LogEntry:
+        return LogEntry(self._turns[i], PHASES.values[self._phases[i]], ACTORS.values[self._actors[i]],
+                        ACTIONS.values[self._actions[i]], self._contents[i])
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("log index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        for i in range(len(self)):
+            yield self._entry(i)
+
+    def __reversed__(self) -> Iterator[LogEntry]:
+        for i in range(len(self) - 1, -1, -1):
+            yield self._entry(i)
+
+    def __eq__(self, other):
+        return list(self) == list(other) if isinstance(other, (LogStore, list)) else NotImplemented
+
+    def __repr__(self):
+        return f"LogStore({len(self)} entries)"
+
+    def lines(self, start: int = 0) -> Iterator[Tuple[str, str, str]]:
+        """(phase, actor, content) from `start` on, without building LogEntry objects (prompt rendering)."""
+        phases, actors = PHASES.values, ACTORS.values
+        for i in range(start, len(self)):
+            yield phases[self._phases[i]], actors[self._actors[i]], self._contents[i]
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str, str, str, str]]:
+        """(turn, phase, actor, action, content) for entries start..end, without building LogEntry objects."""
+        phases, actors, actions = PHASES.values, ACTORS.values, ACTIONS.values
+        for i in range(start, len(self) if end is None else end):
+            yield (self._turns[i], phases[self._phases[i]], actors[self._actors[i]],
+                   actions[self._actions[i]], self._contents[i])
 
 class PlayerState(BaseModel):
     name: str # Version + Model Name
@@ -24,6 +134,8 @@ class PlayerState(BaseModel):
     strategy: str = ""  # Living strategic plan, overwritten each turn
 
 class GameState(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     game_id: str = Field(default_factory=lambda: str(uuid4()))
     turn: int = 1
     phase: str = "Setup"
@@ -31,6 +143,12 @@ class GameState(BaseModel):
     nominees: List[str] = []  # List of player names nominated for elimination
     on_trial: Optional[str] = None  # Name of player currently on trial
     reveal_role_on_death: bool = True  # Whether to reveal role when player dies
-    public_logs: List[LogEntry] = []
-    mafia_logs: List[LogEntry] = [] # Secret logs for Mafia eyes only
-    cop_logs: List[LogEntry] = [] # Secret logs for Cop eyes only
+    public_logs: LogStore = Field(default_factory=LogStore)
+    mafia_logs: LogStore = Field(default_factory=LogStore) # Secret logs for Mafia eyes only
+    cop_logs: LogStore = Field(default_factory=LogStore) # Secret logs for Cop eyes only
+
+    @field_validator("public_logs", "mafia_logs", "cop_logs", mode="before")
+    @classmethod
+    def _as_log_store(cls, value):
+        # Accept plain lists of LogEntry (e.g. hand-built states) and store them compactly
+        return value if isinstance(value, LogStore) else LogStore(value)
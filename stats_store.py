@@ -0,0 +1,362 @@
+"""
+SQLite stats store (WAL mode) - one row per game, per player and per player action.
+
+Writers append inside a short IMMEDIATE transaction, so parallel games and tournament
+workers can share one database file without clobbering each other. Readers never block
+writers under WAL.
+
+The same transaction updates running aggregates (rollups per player, model, provider,
+role and player count, plus team Elo ratings), so each finished game costs O(players)
+and reports read a few small tables no matter how many games are stored.
+
+A legacy game_stats.json next to the database is imported the first time any process
+opens it (recorded in the meta table, so it happens once). Import another file explicitly:
+    python stats_store.py --import game_stats.json
+"""
+
+import os
+import math
+import json
+import time
+import sqlite3
+import argparse
+from typing import Iterable, List, Optional, Tuple
+
+from config import STATS_DB_PATH, ELO_K, ELO_START, ELO_ROLE_PRIOR
+
+ROLLUP_DIMENSIONS = ("player", "model", "provider", "role")
+ROLLUP_COLUMNS = ["games", "wins", "survived", "mafia_games", "mafia_wins", "town_games", "town_wins"]
+LEGACY_JSON = "game_stats.json"
+# Bump when the rollup or Elo formulas change: databases with an older version are rebuilt on open
+ROLLUP_VERSION = "2"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          TEXT PRIMARY KEY,
+    winner      TEXT NOT NULL,
+    turns       INTEGER NOT NULL,
+    mafia       TEXT NOT NULL,          -- JSON list of names
+    seed        INTEGER,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id  TEXT NOT NULL REFERENCES games(id),
+    name     TEXT NOT NULL,
+    role     TEXT NOT NULL,
+    survived INTEGER NOT NULL,
+    provider TEXT,
+    model    TEXT,
+    PRIMARY KEY (game_id, name)
+);
+CREATE INDEX IF NOT EXISTS players_by_name ON players(name);
+CREATE TABLE IF NOT EXISTS turns (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    seq     INTEGER NOT NULL,           -- Order within the game
+    turn    INTEGER NOT NULL,           -- Day/Night number
+    phase   TEXT NOT NULL,
+    player  TEXT NOT NULL,
+    action  TEXT NOT NULL,
+    content TEXT,
+    log     TEXT NOT NULL,              -- public / mafia / cop
+    PRIMARY KEY (game_id, seq)
+);
+CREATE INDEX IF NOT EXISTS turns_by_player ON turns(player);
+
+-- Running aggregates, updated with every inserted game
+CREATE TABLE IF NOT EXISTS rollups (
+    dimension   TEXT NOT NULL,          -- player / model / provider / role
+    key         TEXT NOT NULL,
+    games       INTEGER NOT NULL DEFAULT 0,
+    wins        INTEGER NOT NULL DEFAULT 0,
+    survived    INTEGER NOT NULL DEFAULT 0,
+    mafia_games INTEGER NOT NULL DEFAULT 0,
+    mafia_wins  INTEGER NOT NULL DEFAULT 0,
+    town_games  INTEGER NOT NULL DEFAULT 0,
+    town_wins   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, key)
+);
+CREATE TABLE IF NOT EXISTS game_rollups (
+    player_count INTEGER PRIMARY KEY,
+    games        INTEGER NOT NULL DEFAULT 0,
+    mafia_wins   INTEGER NOT NULL DEFAULT 0,
+    town_wins    INTEGER NOT NULL DEFAULT 0,
+    total_turns  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    player TEXT PRIMARY KEY,
+    elo    REAL NOT NULL,
+    games  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,             -- legacy_import, rollup_version
+    value TEXT NOT NULL
+);
+"""
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a win rate (95% by default). Stays sensible for small samples."""
+    if trials == 0:
+        return 0.0, 0.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+class StatsStore:
+    def __init__(self, path: str = STATS_DB_PATH, timeout: float = 30.0, legacy_json: Optional[str] = None):
+        """legacy_json: old stats file to import once (default: game_stats.json next to the database, "" = none)."""
+        self.path = path
+        # Writers wait up to `timeout` seconds for another process's transaction instead of failing
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._rebuild_rollups()
+        if legacy_json is None and path != ":memory:":
+            legacy_json = os.path.join(os.path.dirname(path), LEGACY_JSON)
+        if legacy_json:
+            self._import_legacy(legacy_json)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_games(self, records: Iterable[dict]) -> int:
+        """Insert finished game records in one transaction. Games already stored are skipped. Returns rows added."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = self._insert_games(records)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def _insert_games(self, records: Iterable[dict]) -> int:
+        """add_games without the transaction (the caller holds one)."""
+        added = 0
+        now = time.time()
+        for record in records:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO games (id, winner, turns, mafia, seed, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (record["id"], record["winner"], record.get("turns", 0), json.dumps(record.get("mafia", [])),
+                 record.get("seed"), now))
+            if not cursor.rowcount:
+                continue
+            added += 1
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO players (game_id, name, role, survived, provider, model) VALUES (?, ?, ?, ?, ?, ?)",
+                [(record["id"], p["name"], p["role"], int(bool(p.get("survived"))), p.get("provider"), p.get("model"))
+                 for p in record.get("players", [])])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO turns (game_id, seq, turn, phase, player, action, content, log) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(record["id"], seq, t["turn"], t["phase"], t["player"], t["action"], t.get("content"), t["log"])
+                 for seq, t in enumerate(record.get("turn_log", []))])
+            self._update_rollups(record["winner"], record.get("turns", 0), record.get("players", []))
+        return added
+
+    def _update_rollups(self, winner: str, turns: int, players: List[dict]):
+        """Fold one game into the aggregates and ratings. Runs inside the caller's transaction."""
+        # Ratings first: the role advantage comes from the games before this one
+        self._update_elo(winner, players)
+
+        rows = []
+        for p in players:
+            is_mafia = p["role"] == "Mafia"
+            won = (is_mafia and winner == "Mafia") or (not is_mafia and winner == "Town")
+            counts = (1, int(won), int(bool(p.get("survived"))), int(is_mafia), int(is_mafia and won),
+                      int(not is_mafia), int(not is_mafia and won))
+            for dimension in ROLLUP_DIMENSIONS:
+                key = p["name"] if dimension == "player" else p.get(dimension)
+                if key is not None:
+                    rows.append((dimension, key) + counts)
+        self.conn.executemany(
+            f"INSERT INTO rollups (dimension, key, {', '.join(ROLLUP_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (dimension, key) DO UPDATE SET "
+            + ", ".join(f"{c} = {c} + excluded.{c}" for c in ROLLUP_COLUMNS), rows)
+
+        self.conn.execute(
+            "INSERT INTO game_rollups (player_count, games, mafia_wins, town_wins, total_turns) VALUES (?, 1, ?, ?, ?) "
+            "ON CONFLICT (player_count) DO UPDATE SET games = games + 1, mafia_wins = mafia_wins + excluded.mafia_wins, "
+            "town_wins = town_wins + excluded.town_wins, total_turns = total_turns + excluded.total_turns",
+            (len(players), int(winner == "Mafia"), int(winner != "Mafia"), turns))
+
+    def _role_advantage(self, player_count: int) -> float:
+        """Mafia's edge in Elo points at this table size, from the Mafia win rate of earlier games.
+
+        The win rate is shrunk towards 50% by ELO_ROLE_PRIOR pseudo-games, so a handful of games
+        cannot produce a huge advantage.
+        """
+        row = self.conn.execute("SELECT games, mafia_wins FROM game_rollups WHERE player_count = ?",
+                                (player_count,)).fetchone()
+        games, mafia_wins = row or (0, 0)
+        p = (mafia_wins + ELO_ROLE_PRIOR / 2) / (games + ELO_ROLE_PRIOR)
+        return 400 * math.log10(p / (1 - p))
+
+    def _update_elo(self, winner: str, players: List[dict]):
+        """Zero-sum team Elo from the two teams' mean ratings plus the Mafia role advantage.
+
+        Delta = K * (result - expected). Each player moves by Delta * (opposing team size / mean
+        team size), so both teams gain or lose the same total and the rating pool stays constant.
+        """
+        names = [p["name"] for p in players]
+        if not names:
+            return
+        placeholders = ", ".join("?" * len(names))
+        ratings = dict(self.conn.execute(f"SELECT player, elo FROM ratings WHERE player IN ({placeholders})", names))
+        mafia = [p["name"] for p in players if p["role"] == "Mafia"]
+        town = [p["name"] for p in players if p["role"] != "Mafia"]
+        if not mafia or not town:
+            return
+
+        mafia_mean = sum(ratings.get(n, ELO_START) for n in mafia) / len(mafia)
+        town_mean = sum(ratings.get(n, ELO_START) for n in town) / len(town)
+        advantage = self._role_advantage(len(players))
+        mafia_expected = 1 / (1 + 10 ** ((town_mean - mafia_mean - advantage) / 400))
+        mafia_delta = ELO_K * ((1.0 if winner == "Mafia" else 0.0) - mafia_expected)
+        mean_team = len(players) / 2
+
+        updates = [(n, ratings.get(n, ELO_START) + mafia_delta * len(town) / mean_team) for n in mafia]
+        updates += [(n, ratings.get(n, ELO_START) - mafia_delta * len(mafia) / mean_team) for n in town]
+        self.conn.executemany(
+            "INSERT INTO ratings (player, elo, games) VALUES (?, ?, 1) "
+            "ON CONFLICT (player) DO UPDATE SET elo = excluded.elo, games = games + 1", updates)
+
+    def _rollup_version(self) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'rollup_version'").fetchone()
+        return row[0] if row else None
+
+    def _rebuild_rollups(self):
+        """(Re)build the aggregates and ratings from the stored games unless they are at ROLLUP_VERSION.
+
+        Covers databases created before rollups existed and rollups computed with older formulas.
+        """
+        if self._rollup_version() == ROLLUP_VERSION:
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have rebuilt them while we waited for the lock
+            if self._rollup_version() != ROLLUP_VERSION:
+                for table in ("rollups", "game_rollups", "ratings"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                players = {}
+                for row in self.conn.execute("SELECT game_id, name, role, survived, provider, model FROM players"):
+                    players.setdefault(row[0], []).append(
+                        {"name": row[1], "role": row[2], "survived": row[3], "provider": row[4], "model": row[5]})
+                # Elo is order dependent: replay games in the order they were recorded
+                games = self.conn.execute("SELECT id, winner, turns FROM games ORDER BY recorded_at, rowid").fetchall()
+                for game_id, winner, turns in games:
+                    self._update_rollups(winner, turns, players.get(game_id, []))
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rollup_version', ?)",
+                                  (ROLLUP_VERSION,))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _import_legacy(self, json_path: str):
+        """Import an old game_stats.json once per database, whichever process opens it first."""
+        if not os.path.exists(json_path) or self.conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_import'").fetchone():
+            return
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                games = json.load(f).get("games", [])
+        except (OSError, ValueError) as e:
+            print(f"[Stats] Could not import {json_path}: {e}")
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have imported it while we waited for the lock
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_import'").fetchone():
+                self.conn.execute("COMMIT")
+                return
+            added = self._insert_games(games)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_import', ?)",
+                              (json.dumps({"path": os.path.abspath(json_path), "games": added, "at": time.time()}),))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        print(f"[Stats] Imported {added} games from {json_path} into {self.path}")
+
+    def import_json(self, json_path: str) -> int:
+        """Load a legacy game_stats.json ({"games": [...]}) into the store."""
+        with open(json_path, "r", encoding="utf-8") as f:
+            games = json.load(f).get("games", [])
+        return self.add_games(games)
+
+    # --- Queries (read the rollups, never scan games) ---
+
+    def summary(self) -> dict:
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(games), 0), COALESCE(SUM(mafia_wins), 0), COALESCE(SUM(town_wins), 0), "
+            "COALESCE(SUM(total_turns), 0) FROM game_rollups").fetchone()
+        return {"games": row[0], "mafia_wins": row[1], "town_wins": row[2],
+                "avg_turns": row[3] / row[0] if row[0] else 0.0}
+
+    def rollup(self, dimension: str) -> List[dict]:
+        """Aggregates for one dimension (player/model/provider/role), best win rate first.
+
+        Each row has the counters plus "win_ci" (95% Wilson interval) and, for players, "elo".
+        """
+        rows = self.conn.execute(f"""
+            SELECT r.key, {', '.join('r.' + c for c in ROLLUP_COLUMNS)}, t.elo
+            FROM rollups r LEFT JOIN ratings t ON r.dimension = 'player' AND t.player = r.key
+            WHERE r.dimension = ?
+            ORDER BY CAST(r.wins AS REAL) / r.games DESC, r.rowid
+        """, (dimension,)).fetchall()
+        result = []
+        for row in rows:
+            stats = dict(zip(["key"] + ROLLUP_COLUMNS + ["elo"], row))
+            stats["win_ci"] = wilson_interval(stats["wins"], stats["games"])
+            result.append(stats)
+        return result
+
+    def player_stats(self) -> List[dict]:
+        """Per-player totals, best overall win rate first."""
+        players = self.rollup("player")
+        for stats in players:
+            stats["name"] = stats["key"]
+            stats["games_played"] = stats["games"]
+        return players
+
+    def player_count_stats(self) -> List[dict]:
+        rows = self.conn.execute(
+            "SELECT player_count, games, mafia_wins, town_wins, total_turns FROM game_rollups ORDER BY player_count").fetchall()
+        return [dict(zip(["player_count", "games", "mafia_wins", "town_wins", "total_turns"], row)) for row in rows]
+
+
+def append_game_records(stats_path: str, records: List[dict]):
+    """Append finished game records to the shared stats database."""
+    with StatsStore(stats_path) as store:
+        store.add_games(records)
+
+
+def open_store(db_path: str = STATS_DB_PATH, legacy_json: Optional[str] = None) -> StatsStore:
+    """Open the store. The legacy JSON file (default: next to the database) is imported on first open."""
+    return StatsStore(db_path, legacy_json=legacy_json)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Mafia stats database")
+    parser.add_argument("--db", default=STATS_DB_PATH, help="SQLite stats database")
+    parser.add_argument("--import", dest="import_path", metavar="JSON", required=True,
+                        help="Import games from a game_stats.json file")
+    args = parser.parse_args()
+
+    with StatsStore(args.db) as store:
+        added = store.import_json(args.import_path)
+    print(f"Imported {added} games from {args.import_path} into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
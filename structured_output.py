@@ -0,0 +1,63 @@
+# structured_output.py - Provider-enforced TurnOutput schema for API calls
+
+"""
+Every provider format is generated from schemas.TurnOutput, so the model and the parser
+can never disagree about the shape of a turn:
+
+    openai_response_format()  response_format json_schema (strict) - OpenAI, xAI, Groq, OpenRouter
+    ANTHROPIC_TOOL            a forced "take_turn" tool call; its input is the turn
+    gemini_schema()           response_schema for Gemini (OpenAPI subset, nullable fields)
+    TURN_SCHEMA               plain JSON schema, also Ollama's "format"
+
+Fields keep TurnOutput's order (strategy -> speech -> vote), which is also the order
+the model writes them in, so the streamed speech still arrives before the vote.
+"""
+
+import json
+from typing import Any, Dict
+
+from schemas import TurnOutput
+
+TOOL_NAME = "take_turn"
+
+
+def turn_schema() -> Dict[str, Any]:
+    """TurnOutput as a strict JSON schema: every field required (null allowed), no extra keys."""
+    properties = {}
+    for name, prop in TurnOutput.model_json_schema()["properties"].items():
+        types = [option["type"] for option in prop.get("anyOf", [prop])]
+        properties[name] = {"type": types if len(types) > 1 else types[0], "description": prop.get("description", "")}
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+TURN_SCHEMA = turn_schema()
+
+ANTHROPIC_TOOL = {
+    "name": TOOL_NAME,
+    "description": "Submit your turn: strategy, speech and vote.",
+    "input_schema": TURN_SCHEMA,
+}
+ANTHROPIC_TOOL_CHOICE = {"type": "tool", "name": TOOL_NAME}
+
+
+def openai_response_format() -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": "turn_output", "strict": True, "schema": TURN_SCHEMA}}
+
+
+def gemini_schema() -> Dict[str, Any]:
+    """TURN_SCHEMA in Gemini's Schema dialect (single type + nullable, explicit property order)."""
+    properties = {}
+    for name, prop in TURN_SCHEMA["properties"].items():
+        types = prop["type"] if isinstance(prop["type"], list) else [prop["type"]]
+        properties[name] = {"type": next(t for t in types if t != "null"), "nullable": "null" in types,
+                            "description": prop["description"]}
+    return {"type": "object", "properties": properties, "required": list(properties),
+            "property_ordering": list(properties)}
+
+
+def anthropic_text(response) -> str:
+    """The turn JSON from an Anthropic message: the take_turn tool input, else the text blocks."""
+    for block in response.content:
+        if block.type == "tool_use" and block.name == TOOL_NAME:
+            return json.dumps(block.input)
+    return "".join(block.text for block in response.content if block.type == "text")
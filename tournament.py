@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tournament runner - plays many headless games concurrently across a process pool.
+
+Each game runs in its own working directory (logs/, games/, memories/) so games
+never clobber each other. Finished game records are merged into the SQLite stats
+database (stats_store.py) by the parent process as each game finishes.
+
+Usage:
+    python tournament.py --games 500 --workers 8
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import traceback
+import contextlib
+import concurrent.futures
+from datetime import datetime
+from typing import Optional, List
+
+from config import MEMORY_ENABLED, STATS_DB_PATH
+from mock_llm import mock_roster
+
+
+def play_game(game_dir: str, seed: int, memory_enabled: bool, seed_memories_dir: Optional[str],
+              roster: Optional[List[dict]] = None) -> dict:
+    """Play one headless game inside game_dir. Runs in a worker process."""
+    # Imported here so the parent process does not build LLM clients
+    from engine import GameEngine
+
+    os.makedirs(game_dir, exist_ok=True)
+
+    # Snapshot shared memories so reflection only writes to this game's copy
+    if memory_enabled and seed_memories_dir and os.path.isdir(seed_memories_dir):
+        shutil.copytree(seed_memories_dir, os.path.join(game_dir, "memories"), dirs_exist_ok=True)
+
+    random.seed(seed)
+    console_path = os.path.join(game_dir, "console.txt")
+    with open(console_path, "w", encoding="utf-8") as console, contextlib.redirect_stdout(console):
+        try:
+            engine = GameEngine(headless=True, work_dir=game_dir, stats_path=None, memory_enabled=memory_enabled,
+                                roster=roster)
+            engine.run_headless()
+            if not engine.game_record:
+                return {"error": "Game ended without a result", "dir": game_dir}
+            return engine.game_record
+        except Exception as e:
+            traceback.print_exc()
+            return {"error": str(e), "dir": game_dir}
+
+
+def run_tournament(num_games: int, workers: int, out_dir: str, stats_path: str, seed: Optional[int] = None,
+                   memory_enabled: bool = MEMORY_ENABLED, seed_memories_dir: Optional[str] = "memories",
+                   roster: Optional[List[dict]] = None) -> List[dict]:
+    """Play num_games games with up to `workers` running at once. Returns the finished game records."""
+    tournament_id = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    root = os.path.join(out_dir, f"tournament_{tournament_id}")
+    os.makedirs(root, exist_ok=True)
+
+    # Import lazily for the same reason as play_game
+    from stats_store import append_game_records
+
+    rng = random.Random(seed)
+    seeds = [rng.randrange(2**31) for _ in range(num_games)]
+
+    print(f"🏆 Tournament {tournament_id}: {num_games} games, {workers} workers -> {root}")
+    records = []
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for i in range(num_games):
+            game_dir = os.path.join(root, f"game_{i + 1:04d}")
+            future = executor.submit(play_game, game_dir, seeds[i], memory_enabled, seed_memories_dir, roster)
+            futures[future] = i + 1
+
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {"error": str(e)}
+
+            if "error" in record:
+                failed += 1
+                print(f"❌ Game {index}: {record['error']}")
+                continue
+
+            # Timestamps collide across parallel games, so make ids unique per tournament
+            record["id"] = f"{tournament_id}_{index:04d}"
+            record["seed"] = seeds[index - 1]
+            records.append(record)
+            # Single writer: merge as results arrive so a crash keeps finished games
+            append_game_records(stats_path, [record])
+            print(f"✅ Game {index}: {record['winner']} wins in {record['turns']} turns "
+                  f"({len(records) + failed}/{num_games})")
+
+    summary = {
+        "tournament": tournament_id,
+        "games": len(records),
+        "failed": failed,
+        "mafia_wins": sum(1 for r in records if r["winner"] == "Mafia"),
+        "town_wins": sum(1 for r in records if r["winner"] == "Town"),
+    }
+    with open(os.path.join(root, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n🏁 Done: {summary['games']} games ({failed} failed). "
+          f"Mafia {summary['mafia_wins']} / Town {summary['town_wins']}. Stats merged into {stats_path}")
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many headless AI Mafia games in parallel")
+    parser.add_argument("--games", type=int, default=10, help="Number of games to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Games running at once")
+    parser.add_argument("--out", default="tournaments", help="Directory for per-game working directories")
+    parser.add_argument("--stats", default=STATS_DB_PATH, help="Stats database the results are merged into")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible role/order shuffles")
+    parser.add_argument("--no-memory", action="store_true", help="Skip memory loading and reflection")
+    parser.add_argument("--mock", type=int, metavar="N", default=0,
+                        help="Use N local mock players instead of ROSTER_CONFIG (engine load test)")
+    args = parser.parse_args()
+
+    try:
+        run_tournament(args.games, args.workers, args.out, args.stats, seed=args.seed,
+                       memory_enabled=MEMORY_ENABLED and not args.no_memory,
+                       roster=mock_roster(args.mock) if args.mock else None)
+    except KeyboardInterrupt:
+        print("\nTournament Terminated by User.")
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# tts_cache.py - Content-addressed on-disk cache of synthesized speech
+
+import os
+import re
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from config import TTS_CACHE_DIR, TTS_CACHE_MAX_MB
+
+_KEY_FILE = re.compile(r"^[0-9a-f]{64}\.mp3$")
+
+
+class TTSCache:
+    """MP3 clips keyed by sha256(text, voice, rate), evicted least-recently-used past a size cap.
+
+    Recency is the file's mtime (touched on every hit), so it carries over between games
+    and processes. The index is built from the directory once and kept in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = TTS_CACHE_DIR, max_mb: float = TTS_CACHE_MAX_MB):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "mafia_tts_cache")
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[float]] = {}  # key -> [size, last used]
+        os.makedirs(self.directory, exist_ok=True)
+        for entry in os.scandir(self.directory):
+            if _KEY_FILE.match(entry.name):
+                stat = entry.stat()
+                self._index[entry.name[:-4]] = [stat.st_size, stat.st_mtime]
+
+    @staticmethod
+    def key(text: str, voice: str, rate: str) -> str:
+        return hashlib.sha256("\0".join((text, voice, rate)).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                self._index.pop(key, None)
+            return None
+        with self._lock:
+            self.hits += 1
+            self._index[key] = [len(audio), now]
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        # Write to a temp name first so a concurrent reader never sees half a clip
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"[TTS Cache] Could not store clip: {e}")
+            return
+        with self._lock:
+            self._index[key] = [len(audio), time.time()]
+            self._evict()
+
+    def _evict(self):
+        total = sum(size for size, _ in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+            del self._index[key]
+            total -= size
+            self.evictions += 1
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return int(sum(size for size, _ in self._index.values()))
+
+    def report_lines(self) -> List[str]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            if not lookups:
+                return []
+            return [f"hits={self.hits} misses={self.misses} hit={self.hits / lookups * 100:.0f}% "
+                    f"evicted={self.evictions} size={sum(s for s, _ in self._index.values()) / 1024 / 1024:.1f}MB "
+                    f"({self.directory})"]
@@ -3,10 +3,14 @@
 import os
 import asyncio
 import tempfile
-import subprocess
 import threading
+import concurrent.futures
+from typing import List, Optional, Union
 
-from config import TTS_RATE, NARRATOR_VOICE
+import mp3_utils
+from tts_cache import TTSCache
+from audio_backends import AudioBackend, NullBackend, detect_backend
+from config import TTS_RATE, TTS_MAX_CONCURRENT, NARRATOR_VOICE
 
 try:
     import edge_tts
@@ -14,16 +18,79 @@ try:
 except ImportError:
     EDGE_TTS_AVAILABLE = False
 
+# A prepared clip: a file path, or a future that resolves to one (None = nothing to play)
+Clip = Union[str, concurrent.futures.Future, None]
+
+
+class SynthesisService:
+    """One long-lived asyncio loop on a daemon thread that runs every synthesis job.
+
+    Jobs are coroutines submitted from any thread; each gets a concurrent.futures.Future
+    back. Up to max_concurrent run at once, the rest wait their turn in submission order.
+    Replaces an asyncio.run() (new loop, resolver and SSL setup) per utterance.
+    """
+
+    def __init__(self, max_concurrent: int = TTS_MAX_CONCURRENT):
+        self._loop = asyncio.new_event_loop()
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._thread = threading.Thread(target=self._loop.run_forever, name="tts-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(self._run(coro), self._loop)
+
+    async def _run(self, coro):
+        async with self._slots:
+            return await coro
+
+    def close(self):
+        """Stop the loop once the jobs already submitted have finished."""
+        asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+
+    async def _drain(self):
+        current = asyncio.current_task()
+        await asyncio.gather(*(t for t in asyncio.all_tasks() if t is not current), return_exceptions=True)
+        self._loop.stop()
+
+
+def _resolved(value) -> concurrent.futures.Future:
+    future = concurrent.futures.Future()
+    future.set_result(value)
+    return future
+
+
+def _write_clip(audio: bytes) -> str:
+    """Write audio to a new temp .mp3 (deleted after playback) and return its path."""
+    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+        f.write(audio)
+        return f.name
+
 
 class TTSEngine:
-    """Edge TTS wrapper with background playback support"""
+    """Edge TTS wrapper with background playback support.
+
+    Synthesis runs on a SynthesisService; submit_speech() returns a future right away so
+    the engine can queue several upcoming lines and play them in order as they finish.
+    """
 
-    def __init__(self, enabled: bool = True, rate: str = TTS_RATE):
+    def __init__(self, enabled: bool = True, rate: str = TTS_RATE, backend: Optional[AudioBackend] = None,
+                 max_concurrent: int = TTS_MAX_CONCURRENT):
         self.enabled = enabled and EDGE_TTS_AVAILABLE
         self.rate = rate
+        self.max_concurrent = max_concurrent
+        # Playback (see audio_backends.py). Nothing to play to = nothing worth synthesizing, unless
+        # the caller passes a backend explicitly (render_replay.py synthesizes with NullBackend).
+        self.backend = backend or (detect_backend() if self.enabled else NullBackend())
+        if self.enabled and self.backend.is_null and backend is None:
+            print("[TTS] No audio device or player (afplay, ffplay, mpg123, paplay) found - speech disabled")
+            self.enabled = False
         self._voice_map = {}  # player_name -> voice_id
-        self._name_cache = {}  # player_name -> cached audio path
+        self._name_cache = {}  # player_name -> asyncio future of the name clip audio (loop thread only)
         self._current_thread = None  # Track current TTS thread
+        self._service: Optional[SynthesisService] = None  # Started on first use
+        self._service_lock = threading.Lock()
+        # Every synthesized line, keyed by (text, voice, rate): recurring narration costs no request
+        self.cache: Optional[TTSCache] = TTSCache() if self.enabled else None
         if enabled and not EDGE_TTS_AVAILABLE:
             print("[TTS] edge-tts not installed. Run: pip install edge-tts")
 
@@ -35,83 +102,126 @@ class TTSEngine:
         if self._current_thread and self._current_thread.is_alive():
             self._current_thread.join()
 
-    def _get_cached_name(self, player_name: str) -> str:
-        """Get or create cached audio file for player name announcement."""
-        if player_name in self._name_cache:
-            path = self._name_cache[player_name]
-            if os.path.exists(path):
-                return path
-
-        # Generate and cache name audio in narrator voice
-        cache_dir = os.path.join(tempfile.gettempdir(), "mafia_tts_cache")
-        os.makedirs(cache_dir, exist_ok=True)
-        cache_path = os.path.join(cache_dir, f"name_{player_name}.mp3")
-
-        if not os.path.exists(cache_path):
-            try:
-                asyncio.run(self._generate_audio(f"{player_name}.", NARRATOR_VOICE, cache_path))
-            except Exception as e:
-                print(f"[TTS] Failed to cache name: {e}")
-                return None
-
-        self._name_cache[player_name] = cache_path
-        return cache_path
+    def _submit(self, coro) -> concurrent.futures.Future:
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    self._service = SynthesisService(self.max_concurrent)
+        return self._service.submit(coro)
+
+    def cache_report(self) -> List[str]:
+        return self.cache.report_lines() if self.cache else []
+
+    def close(self):
+        if self._service:
+            self._service.close()
+
+    async def _get_cached_name(self, player_name: str) -> Optional[bytes]:
+        """Name announcement audio (narrator voice), synthesized once per name and kept in memory."""
+        task = self._name_cache.get(player_name)
+        if task is None or (task.done() and not task.result()):
+            task = self._name_cache[player_name] = asyncio.ensure_future(self._cache_name(player_name))
+        return await asyncio.shield(task)
+
+    async def _cache_name(self, player_name: str) -> Optional[bytes]:
+        # Generate (or load from the disk cache) name audio in narrator voice
+        try:
+            return await self._synthesize(f"{player_name}.", NARRATOR_VOICE)
+        except Exception as e:
+            print(f"[TTS] Failed to cache name: {e}")
+            return None
 
-    async def _generate_audio(self, text: str, voice: str, output_path: str):
-        """Generate audio file from text."""
+    async def _synthesize(self, text: str, voice: str) -> bytes:
+        """MP3 audio for text: from the disk cache, else from edge-tts (and then cached)."""
+        key = TTSCache.key(text, voice, self.rate)
+        audio = self.cache.get(key) if self.cache else None
+        if audio:
+            return audio
+        audio = await self._fetch_audio(text, voice)
+        if self.cache:
+            self.cache.put(key, audio)
+        return audio
+
+    async def _fetch_audio(self, text: str, voice: str) -> bytes:
+        """MP3 audio for text, collected in memory from the edge-tts stream."""
         communicate = edge_tts.Communicate(text, voice, rate=self.rate)
-        await asyncio.wait_for(communicate.save(output_path), timeout=30.0)
+
+        async def collect():
+            return b"".join([chunk["data"] async for chunk in communicate.stream() if chunk["type"] == "audio"])
+        audio = await asyncio.wait_for(collect(), timeout=30.0)
+        if not audio:
+            raise RuntimeError("No audio received")
+        return audio
 
     def speak(self, text: str, player_name: str = None, voice: str = None, background: bool = False, announce_name: bool = False):
         """Speak text. If background=True, runs in background thread. If announce_name=True, plays cached name in narrator voice first."""
         if not self.enabled or not text or not text.strip():
             return
 
-        path = self.prepare_speech(text, player_name, voice, announce_name)
-        if path:
-            self.play_file(path, background)
+        self.play_file(self.submit_speech(text, player_name, voice, announce_name), background)
 
     def prepare_speech(self, text: str, player_name: str = None, voice: str = None, announce_name: bool = False) -> str:
         """Generate audio file and return path. Blocks until generation complete."""
+        return self.submit_speech(text, player_name, voice, announce_name).result()
+
+    def submit_speech(self, text: str, player_name: str = None, voice: str = None,
+                      announce_name: bool = False) -> concurrent.futures.Future:
+        """Start generating audio; the future resolves to its path (None if disabled or failed)."""
         if not self.enabled or not text or not text.strip():
-            return None
+            return _resolved(None)
+        use_voice = voice or self._voice_map.get(player_name, "en-US-AriaNeural")
+        return self._submit(self._prepare(text, player_name if announce_name else None, use_voice))
 
+    def submit_audio(self, text: str, player_name: str = None, voice: str = None,
+                     announce_name: bool = False) -> concurrent.futures.Future:
+        """Like submit_speech, but the future resolves to the MP3 bytes instead of a file."""
+        if not self.enabled or not text or not text.strip():
+            return _resolved(None)
         use_voice = voice or self._voice_map.get(player_name, "en-US-AriaNeural")
+        return self._submit(self._prepare_audio(text, player_name if announce_name else None, use_voice))
+
+    async def _prepare(self, text: str, announce: Optional[str], voice: str) -> Optional[str]:
+        audio = await self._prepare_audio(text, announce, voice)
+        # Written once, after name + speech are joined in memory
+        return _write_clip(audio) if audio else None
+
+    async def _prepare_audio(self, text: str, announce: Optional[str], voice: str) -> Optional[bytes]:
         try:
-             # Pre-generate main speech audio (strip markdown emphasis)
+            # Pre-generate main speech audio (strip markdown emphasis)
             clean_text = text.replace("*", "")
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                speech_path = f.name
-            asyncio.run(self._generate_audio(clean_text, use_voice, speech_path))
-
-            # Get name audio and concatenate if needed
-            if announce_name and player_name:
-                name_audio = self._get_cached_name(player_name)
-                if name_audio:
-                     # Concatenate name + speech
-                    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                        combined_path = f.name
-
-                    list_path = speech_path + ".list"
-                    with open(list_path, "w") as f:
-                         f.write(f"file '{name_audio}'\nfile '{speech_path}'")
-
-                    subprocess.run(
-                        ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", combined_path],
-                        check=True, capture_output=True, timeout=30
-                    )
-                    os.unlink(list_path)
-                    os.unlink(speech_path) # Delete original speech part
-                    return combined_path
-
-            return speech_path
+            # The name clip (usually cached) is made alongside the speech
+            name_audio, speech_audio = await asyncio.gather(
+                self._get_cached_name(announce) if announce else asyncio.sleep(0),
+                self._synthesize(clean_text, voice))
+            # Name + speech are joined frame by frame in memory
+            return mp3_utils.concat([name_audio, speech_audio]) if name_audio else speech_audio
 
         except Exception as e:
             print(f"[TTS Error in prepare] {e}")
             return None
 
-    def play_file(self, path: str, background: bool = False):
-        """Play an existing audio file"""
+    def concat_audio(self, clips: List[Clip]) -> concurrent.futures.Future:
+        """Join clips (paths or futures, None skipped) into one file and delete the parts."""
+        return self._submit(self._concat_clips(clips)) if self.enabled else _resolved(None)
+
+    async def _concat_clips(self, clips: List[Clip]) -> Optional[str]:
+        paths = [p for p in [await asyncio.wrap_future(c) if isinstance(c, concurrent.futures.Future) else c
+                             for c in clips] if p]
+        if len(paths) < 2:
+            return paths[0] if paths else None
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+                combined_path = f.name
+            mp3_utils.concat_files(paths, combined_path)
+            for path in paths:
+                os.unlink(path)
+            return combined_path
+        except Exception as e:
+            print(f"[TTS Error in concat] {e}")
+            return paths[0]
+
+    def play_file(self, path: Clip, background: bool = False):
+        """Play an audio file, or the file a submit_speech() future resolves to (waited for on the playback thread)"""
         if background:
             self.wait_for_speech()
             self._current_thread = threading.Thread(
@@ -122,29 +232,15 @@ class TTSEngine:
             self.wait_for_speech()
             self._play_file_sync(path)
 
-    def _play_file_sync(self, path: str):
+    def _play_file_sync(self, path: Clip):
+        if isinstance(path, concurrent.futures.Future):
+            path = path.result()
+        if not path:
+            return
         try:
-            subprocess.run(["afplay", path], check=True)
+            self.backend.play(path)
         except Exception as e:
             print(f"[TTS Play Error] {e}")
         finally:
             if os.path.exists(path):
                 os.unlink(path)
-
-    def _speak_sync(self, text: str, voice: str):
-        """Synchronous speech (runs TTS and plays audio)"""
-        try:
-            asyncio.run(self._speak_async(text, voice))
-        except Exception as e:
-            print(f"[TTS Error] {e}")
-
-    async def _speak_async(self, text: str, voice: str):
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-            temp_path = f.name
-        try:
-            communicate = edge_tts.Communicate(text, voice, rate=self.rate)
-            await communicate.save(temp_path)
-            subprocess.run(["afplay", temp_path], check=True)  # macOS
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)